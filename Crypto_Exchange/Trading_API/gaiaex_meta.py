@@ -0,0 +1,119 @@
+import os
+import time
+import orjson
+from decimal import Decimal, ROUND_DOWN
+from gaiaex_client import BASE_URL, SYMBOLS_PATH, REQUEST_TIMEOUT, create_session
+
+SYMBOLS_TTL = 300  # Seconds to reuse the parsed symbols list before refetching
+SYMBOLS_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'gaiaex', 'symbols.json')  # Lets back-to-back runs share one fetch
+
+SESSION = create_session()
+
+# Symbol metadata changes far less often than a script runs, so one successful fetch
+# (and everything derived from it) is reused for SYMBOLS_TTL seconds
+_symbols_cache = {'expires': 0.0, 'symbols': None, 'precision': None, 'tradable': None}
+
+
+def _load_symbols_file():
+    """Return (raw response, seconds left) from a recent run's cache file, or None if it is missing or stale."""
+    try:
+        remaining = SYMBOLS_TTL - (time.time() - os.path.getmtime(SYMBOLS_CACHE_FILE))
+        if remaining <= 0:
+            return None
+        with open(SYMBOLS_CACHE_FILE, 'rb') as file:
+            return file.read(), remaining
+    except OSError:
+        return None
+
+def _save_symbols_file(content):
+    """Persist a raw symbols response for later runs; written to a temp file first so readers never see a partial one."""
+    try:
+        os.makedirs(os.path.dirname(SYMBOLS_CACHE_FILE), exist_ok=True)
+        temp_file = f"{SYMBOLS_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(temp_file, 'wb') as file:
+            file.write(content)
+        os.replace(temp_file, SYMBOLS_CACHE_FILE)
+    except OSError:
+        pass  # An unwritable cache only costs the next run one request
+
+def fetch_symbols():
+    """Fetch the exchange's symbol list, reusing a successful response for SYMBOLS_TTL seconds, in process and on disk."""
+    if _symbols_cache['symbols'] is not None and time.monotonic() < _symbols_cache['expires']:
+        return _symbols_cache['symbols']
+
+    symbols = None
+    cached = _load_symbols_file()
+    if cached is not None:
+        content, remaining = cached
+        try:
+            symbols = orjson.loads(content).get('symbols', [])
+        except orjson.JSONDecodeError:
+            symbols = None
+
+    if symbols is None:
+        response = SESSION.get(f"{BASE_URL}{SYMBOLS_PATH}", timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            print("Failed to fetch pairs list:", response.text)
+            return None
+        symbols = orjson.loads(response.content).get('symbols', [])
+        remaining = SYMBOLS_TTL
+        _save_symbols_file(response.content)
+
+    _symbols_cache['symbols'] = tuple(symbols)
+    _symbols_cache['precision'] = None
+    _symbols_cache['tradable'] = None
+    _symbols_cache['expires'] = time.monotonic() + remaining
+    return _symbols_cache['symbols']
+
+def fetch_pairs_precision():
+    """Fetch (pricePrecision, quantityPrecision) tuples keyed by lowercase symbol and by lowercase base asset."""
+    data = fetch_symbols()
+    if data is None:
+        return {}, {}
+    if _symbols_cache['precision'] is None:
+        # One pass fills both maps, sharing a single tuple per symbol
+        precision_data, asset_to_symbol_map = {}, {}
+        for s in data:
+            precision_data[s['symbol'].lower()] = asset_to_symbol_map[s['baseAsset'].lower()] = (s['pricePrecision'], s['quantityPrecision'])
+        _symbols_cache['precision'] = (precision_data, asset_to_symbol_map)
+    return _symbols_cache['precision']
+
+def fetch_tradable_symbols():
+    """Fetch trading pairs and format them into tradable symbol names."""
+    data = fetch_symbols()
+    if data is None:
+        return ()
+    if _symbols_cache['tradable'] is None:
+        _symbols_cache['tradable'] = tuple(
+            f"{symbol['baseAsset']}/{symbol['quoteAsset']}"  # Convert to 'Base/Quote' format
+            for symbol in data
+            if symbol['quoteAsset'].upper() == 'USDT'  # Filter for USDT pairs only (if needed)
+        )
+    return _symbols_cache['tradable']
+
+def truncate(value, precision):
+    """Truncate a number down to `precision` decimal places; an unusable precision (e.g. "N/A") leaves it unchanged."""
+    try:
+        precision = int(precision)
+    except (TypeError, ValueError):
+        print(f"Invalid precision: {precision}. Skipping truncation.")
+        return value
+    # Decimal from the shortest repr avoids float artefacts such as 0.29 * 100 == 28.999999999999996,
+    # which used to truncate 0.29 to 0.28
+    return float(Decimal(repr(value)).quantize(Decimal(1).scaleb(-precision), rounding=ROUND_DOWN))
+
+
+class SymbolCatalog:
+    """Everything a script derives from the symbols list, built once at startup and passed to whatever needs it."""
+    def __init__(self, precision_data, asset_to_symbol_map, tradable_symbols):
+        self.precision_data = precision_data
+        self.asset_to_symbol_map = asset_to_symbol_map
+        self.tradable_symbols = tradable_symbols
+        # Tradable 'Base/Quote' names indexed by lowercase base asset, for exact per-asset lookups
+        self.symbol_by_base = {symbol.split('/')[0].lower(): symbol for symbol in tradable_symbols}
+
+    @classmethod
+    def load(cls):
+        """Build a catalog from the cached symbols list; costs at most one request."""
+        precision_data, asset_to_symbol_map = fetch_pairs_precision()
+        return cls(precision_data, asset_to_symbol_map, fetch_tradable_symbols())
@@ -0,0 +1,7 @@
+import msgspec
+
+
+class Depth(msgspec.Struct):
+    # /sapi/v1/depth body; only the book sides are decoded, other fields in the payload are skipped
+    bids: list[list[float | str]] = []
+    asks: list[list[float | str]] = []
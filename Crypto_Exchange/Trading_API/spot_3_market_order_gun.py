@@ -1,5 +1,8 @@
-import requests
+import argparse
+import logging
+import httpx
 import json
+import orjson
 import hashlib
 import hmac
 import time
@@ -14,6 +17,14 @@ SIDE = 'BUY'  # BUY or SELL
 ORDER_TYPE = 'MARKET'  # Order type
 ORDER_COUNT = 50  # Number of market orders to be placed
 
+# Bound once so the per-order signature avoids the hashlib attribute lookup
+_SHA256 = hashlib.sha256
+# Constant parts of the URL and signature payload, built once at import
+_FULL_URL = BASE_URL + REQUEST_PATH
+_SIG_CONST = b"POST" + REQUEST_PATH.encode()
+# One HTTP/2 connection shared by every order, so consecutive POSTs reuse the same TLS session
+CLIENT = httpx.Client(http2=True, base_url=BASE_URL)
+
 
 def load_config(config_file):
     with open(config_file, 'r') as file:
@@ -21,8 +32,7 @@ def load_config(config_file):
 
 
 def place_spot_market_order(api_key, secret_key, symbol, volume, side, order_type='MARKET', recv_window=5000):
-    full_url = BASE_URL + REQUEST_PATH
-    print(full_url)
+    logging.debug("%s", _FULL_URL)
     timestamp = int(time.time() * 1000)
     params = {
         'symbol': symbol,
@@ -32,11 +42,11 @@ def place_spot_market_order(api_key, secret_key, symbol, volume, side, order_typ
         'timestamp': timestamp,
         'recvWindow': recv_window
     }
-    body = json.dumps(params)
+    body = orjson.dumps(params)  # Bytes, reused as-is for both the signature and the request body
 
     # Creating the signature based on the documentation
-    signature_payload = f"{timestamp}POST{REQUEST_PATH}{body}".encode('utf-8')
-    signature = hmac.new(secret_key.encode(), signature_payload, hashlib.sha256).hexdigest()
+    signature_payload = str(timestamp).encode() + _SIG_CONST + body
+    signature = hmac.new(secret_key, signature_payload, _SHA256).hexdigest()
     
     headers = {
         'X-CH-APIKEY': api_key,
@@ -46,23 +56,28 @@ def place_spot_market_order(api_key, secret_key, symbol, volume, side, order_typ
     }
 
     try:
-        response = requests.post(full_url, headers=headers, data=body)
+        response = CLIENT.post(REQUEST_PATH, headers=headers, content=body)
         if response.status_code == 200:
             data = response.json()
-            print(f"Spot market order placed successfully: {data}")
+            logging.info("Spot market order placed successfully: %s", data)
         else:
-            print(f"Failed to place spot market order. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
-        print(f"An error occurred: {e}")
+            logging.error("Failed to place spot market order. Status Code: %s, Response: %s", response.status_code, response.text)
+    except httpx.HTTPError as e:
+        logging.error("An error occurred: %s", e)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only log warnings and errors')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
     config = load_config(CONFIG_FILE)
     api_key = config['GAIAEX_API_KEY']
-    secret_key = config['GAIAEX_SECRET_KEY']
+    secret_key = config['GAIAEX_SECRET_KEY'].encode()  # Pre-encoded once for every order signature
     
     # Loop to place multiple market orders
     for i in range(ORDER_COUNT):
-        print(f"Placing order {i + 1} of {ORDER_COUNT}")
+        logging.info("Placing order %d of %d", i + 1, ORDER_COUNT)
         place_spot_market_order(api_key, secret_key, symbol=SYMBOL, volume=VOLUME, side=SIDE, order_type=ORDER_TYPE)
         time.sleep(1)  # Optional delay between orders to avoid rate limit issues
@@ -1,5 +1,8 @@
+import argparse
+import logging
 import requests
 import json
+import orjson
 import hashlib
 import hmac
 import time
@@ -15,6 +18,10 @@ PRICE = 100000  # Limit order price
 ORDER_TYPE = 'LIMIT'  # Order type
 ORDER_COUNT = 10  # Number of limit orders to be placed
 
+# Constant parts of the URL and signature payload, built once at import
+_FULL_URL = BASE_URL + REQUEST_PATH
+_SIG_CONST = b"POST" + REQUEST_PATH.encode()
+
 
 def load_config(config_file):
     with open(config_file, 'r') as file:
@@ -22,7 +29,6 @@ def load_config(config_file):
 
 
 def place_spot_limit_order(api_key, secret_key, symbol, volume, price, side, order_type='LIMIT', recv_window=5000):
-    full_url = BASE_URL + REQUEST_PATH
     timestamp = int(time.time() * 1000)
     params = {
         'symbol': symbol,
@@ -33,10 +39,10 @@ def place_spot_limit_order(api_key, secret_key, symbol, volume, price, side, ord
         'timestamp': timestamp,
         'recvWindow': recv_window
     }
-    body = json.dumps(params)
+    body = orjson.dumps(params)  # Bytes, reused as-is for both the signature and the request body
 
     # Creating the signature based on the documentation
-    signature_payload = f"{timestamp}POST{REQUEST_PATH}{body}".encode('utf-8')
+    signature_payload = str(timestamp).encode() + _SIG_CONST + body
     signature = hmac.new(secret_key.encode(), signature_payload, hashlib.sha256).hexdigest()
     
     headers = {
@@ -47,23 +53,28 @@ def place_spot_limit_order(api_key, secret_key, symbol, volume, price, side, ord
     }
 
     try:
-        response = requests.post(full_url, headers=headers, data=body)
+        response = requests.post(_FULL_URL, headers=headers, data=body)
         if response.status_code == 200:
             data = response.json()
-            print(f"Spot limit order placed successfully: {data}")
+            logging.info("Spot limit order placed successfully: %s", data)
         else:
-            print(f"Failed to place spot limit order. Status Code: {response.status_code}, Response: {response.text}")
+            logging.error("Failed to place spot limit order. Status Code: %s, Response: %s", response.status_code, response.text)
     except requests.RequestException as e:
-        print(f"An error occurred: {e}")
+        logging.error("An error occurred: %s", e)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only log warnings and errors')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
     config = load_config(CONFIG_FILE)
     api_key = config['GAIAEX_API_KEY']
     secret_key = config['GAIAEX_SECRET_KEY']
     
     # Loop to place multiple limit orders
     for i in range(ORDER_COUNT):
-        print(f"Placing order {i + 1} of {ORDER_COUNT}")
+        logging.info("Placing order %d of %d", i + 1, ORDER_COUNT)
         place_spot_limit_order(api_key, secret_key, symbol=SYMBOL, volume=VOLUME, price=PRICE, side=SIDE, order_type=ORDER_TYPE)
         time.sleep(1)  # Optional delay between orders to avoid rate limit issues
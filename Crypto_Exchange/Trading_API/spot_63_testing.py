@@ -1,5 +1,6 @@
 import requests
 import json
+import orjson
 import hashlib
 import hmac
 import time
@@ -61,9 +62,11 @@ def fetch_pairs_precision():
     response = requests.get(f"{BASE_URL}{SYMBOLS_PATH}")
     if response.status_code != 200:
         return {}, {}
-    data = response.json().get('symbols', [])
-    precision_data = {s['symbol'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    asset_to_symbol_map = {s['baseAsset'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
+    data = orjson.loads(response.content).get('symbols', [])
+    # One pass fills both maps, sharing a single precision dict per symbol
+    precision_data, asset_to_symbol_map = {}, {}
+    for s in data:
+        precision_data[s['symbol'].lower()] = asset_to_symbol_map[s['baseAsset'].lower()] = {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']}
     return precision_data, asset_to_symbol_map
 
 def fetch_best_bid(asset):
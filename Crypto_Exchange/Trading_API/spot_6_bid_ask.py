@@ -1,5 +1,9 @@
+import argparse
+import logging
+import msgspec
 import requests
 import time
+from gaiaex_models import Depth
 
 # Constants for user customization
 BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
@@ -14,26 +18,29 @@ def fetch_and_print_bid_ask_spread(symbol, interval=1):
         try:
             response = requests.get(depth_url, params=params)
             if response.status_code == 200:
-                data = response.json()
-                if data.get('bids') and data.get('asks'):
-                    best_bid = float(data['bids'][0][0])
-                    best_ask = float(data['asks'][0][0])
+                depth = msgspec.json.decode(response.content, type=Depth)
+                if depth.bids and depth.asks:
+                    best_bid = float(depth.bids[0][0])
+                    best_ask = float(depth.asks[0][0])
                     spread = best_ask - best_bid
-                    timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]")
-                    print(f"{timestamp} Best Bid: {best_bid}, Best Ask: {best_ask}, Spread: {spread}")
+                    logging.info("Best Bid: %s, Best Ask: %s, Spread: %s", best_bid, best_ask, spread)
                 else:
-                    timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]")
-                    print(f"{timestamp} No bids or asks available")
+                    logging.warning("No bids or asks available")
             else:
-                timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]")
-                print(f"{timestamp} Failed to fetch market depth. Status Code: {response.status_code}, Response: {response.text}")
+                logging.error("Failed to fetch market depth. Status Code: %s, Response: %s", response.status_code, response.text)
         except requests.RequestException as e:
-            timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]")
-            print(f"{timestamp} An error occurred while fetching market depth: {e}")
+            logging.error("An error occurred while fetching market depth: %s", e)
+        except msgspec.MsgspecError as e:
+            logging.error("Malformed market depth response: %s", e)
         
         time.sleep(interval)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only log warnings and errors')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format='%(asctime)s %(message)s', datefmt='[%Y-%m-%d %H:%M:%S]')
+
     # Fetch and print bid, ask, and spread every second
     fetch_and_print_bid_ask_spread(SYMBOL)
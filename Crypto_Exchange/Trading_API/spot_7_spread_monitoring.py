@@ -1,47 +1,67 @@
+import argparse
+import asyncio
+import logging
+import aiohttp
+import msgspec
 import requests
-import time
+from gaiaex_models import Depth
 
 # Constants for user customization
 BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
+MAX_CONNECTIONS = 64  # Upper bound on concurrent depth requests per cycle
 
 
 def fetch_pairs_list():
     url = f"{BASE_URL}/sapi/v1/symbols"  # URL to fetch pairs list
     response = requests.get(url)
-    
+
     if response.status_code == 200:
         data = response.json()
         symbols = data.get('symbols', [])
         return [symbol['symbol'] for symbol in symbols]
     else:
-        print("Failed to fetch pairs list:", response.text)
+        logging.error("Failed to fetch pairs list: %s", response.text)
         return []
 
 
-def fetch_and_print_bid_ask_spread(symbol, interval=1):
+async def fetch_and_print_bid_ask_spread(symbol, session):
     depth_url = f"{BASE_URL}/sapi/v1/depth"
     params = {'symbol': symbol, 'limit': 5}
-    
+
     try:
-        response = requests.get(depth_url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('bids') and data.get('asks'):
-                best_bid = float(data['bids'][0][0])
-                best_ask = float(data['asks'][0][0])
-                spread = best_ask - best_bid
-                print(f"Symbol: {symbol}, Best Bid: {best_bid}, Best Ask: {best_ask}, Spread: {spread}")
+        async with session.get(depth_url, params=params) as response:
+            if response.status == 200:
+                depth = msgspec.json.decode(await response.read(), type=Depth)
+                if depth.bids and depth.asks:
+                    best_bid = float(depth.bids[0][0])
+                    best_ask = float(depth.asks[0][0])
+                    spread = best_ask - best_bid
+                    logging.info("Symbol: %s, Best Bid: %s, Best Ask: %s, Spread: %s", symbol, best_bid, best_ask, spread)
+                else:
+                    logging.warning("Symbol: %s, No bids or asks available", symbol)
             else:
-                print(f"Symbol: {symbol}, No bids or asks available")
-        else:
-            print(f"Failed to fetch market depth for {symbol}. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
-        print(f"An error occurred while fetching market depth for {symbol}: {e}")
+                text = await response.text()
+                logging.error("Failed to fetch market depth for %s. Status Code: %s, Response: %s", symbol, response.status, text)
+    except aiohttp.ClientError as e:
+        logging.error("An error occurred while fetching market depth for %s: %s", symbol, e)
+    except msgspec.MsgspecError as e:
+        logging.error("Malformed market depth response for %s: %s", symbol, e)
+
+
+async def monitor_spreads(symbols, interval=1):
+    # One pooled session for every cycle; all symbols are fetched concurrently so a cycle costs ~1 RTT instead of N
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        while True:
+            await asyncio.gather(*(fetch_and_print_bid_ask_spread(symbol, session) for symbol in symbols))
+            await asyncio.sleep(interval)  # Delay between each cycle to avoid rate limit issues
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only log warnings and errors')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
     symbols = fetch_pairs_list()
-    while True:
-        for symbol in symbols:
-            fetch_and_print_bid_ask_spread(symbol)
-        time.sleep(1)  # Delay between each cycle to avoid rate limit issues
+    asyncio.run(monitor_spreads(symbols))
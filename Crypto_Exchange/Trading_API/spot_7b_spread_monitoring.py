@@ -1,5 +1,7 @@
+import msgspec
 import requests
 from prettytable import PrettyTable
+from gaiaex_models import Depth
 
 # Constants for user customization
 BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
@@ -32,10 +34,10 @@ def fetch_spread(symbol):
     try:
         response = requests.get(depth_url, params=params)
         if response.status_code == 200:
-            data = response.json()
-            if data.get('bids') and data.get('asks'):
-                best_bid = float(data['bids'][0][0])
-                best_ask = float(data['asks'][0][0])
+            depth = msgspec.json.decode(response.content, type=Depth)
+            if depth.bids and depth.asks:
+                best_bid = float(depth.bids[0][0])
+                best_ask = float(depth.asks[0][0])
                 spread = best_ask - best_bid
                 return spread
             else:
@@ -47,6 +49,9 @@ def fetch_spread(symbol):
     except requests.RequestException as e:
         print(f"An error occurred while fetching market depth for {symbol}: {e}")
         return 'N/A'
+    except msgspec.MsgspecError as e:
+        print(f"Malformed market depth response for {symbol}: {e}")
+        return 'N/A'
 
 if __name__ == '__main__':
     pairs_dict = fetch_pairs_list()
@@ -1,13 +1,21 @@
-import requests
-import ccxt
+import asyncio
+import aiohttp
+import httpx
+import ccxt.async_support as ccxta
+import operator
 from prettytable import PrettyTable
+from gaiaex_client import create_session
 
 # Constants for user customization
 BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
+MAX_CONCURRENCY = 16  # Symbols processed concurrently
+ACCEPT_ENCODING = 'gzip, br'  # Compressed depth bodies; brotli decoding needs the httpx[brotli] extra
+
+SESSION = create_session()
 
 def fetch_pairs_list():
     url = 'https://openapi.gaiaex.com/sapi/v1/symbols'  # URL to fetch pairs list
-    response = requests.get(url)
+    response = SESSION.get(url)
     
     if response.status_code == 200:
         data = response.json()
@@ -31,32 +39,31 @@ def fetch_pairs_list():
         print("Failed to fetch pairs list:", response.text)
         return {}
 
-def fetch_spread(symbol):
-    depth_url = f"{BASE_URL}/sapi/v1/depth"
+async def fetch_spread(client, symbol):
+    depth_url = "/sapi/v1/depth"
     params = {'symbol': symbol, 'limit': 5}
     
     try:
-        response = requests.get(depth_url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('bids') and data.get('asks'):
-                best_bid = float(data['bids'][0][0])
-                best_ask = float(data['asks'][0][0])
-                spread = best_ask - best_bid
-                return round(spread, 4)
-            else:
-                print(f"Symbol: {symbol}, No bids or asks available")
-                return 'N/A'
-        else:
+        response = await client.get(depth_url, params=params)
+        if response.status_code != 200:
             print(f"Failed to fetch market depth for {symbol}. Status Code: {response.status_code}, Response: {response.text}")
             return 'N/A'
-    except requests.RequestException as e:
+        data = response.json()
+        if data.get('bids') and data.get('asks'):
+            best_bid = float(data['bids'][0][0])
+            best_ask = float(data['asks'][0][0])
+            spread = best_ask - best_bid
+            return round(spread, 4)
+        else:
+            print(f"Symbol: {symbol}, No bids or asks available")
+            return 'N/A'
+    except (httpx.HTTPError, ValueError) as e:
         print(f"An error occurred while fetching market depth for {symbol}: {e}")
         return 'N/A'
 
-def fetch_exchange_spread(exchange, symbol):
+async def fetch_exchange_spread(exchange, symbol):
     try:
-        order_book = exchange.fetch_order_book(symbol)
+        order_book = await exchange.fetch_order_book(symbol)
         if order_book['bids'] and order_book['asks']:
             best_bid = float(order_book['bids'][0][0])
             best_ask = float(order_book['asks'][0][0])
@@ -81,42 +88,63 @@ def calculate_spread_ratio(gaiaex_spread, exchange_spread):
         return round(gaiaex_spread / exchange_spread, 2)
     return 'N/A'
 
+async def update_spread(client, semaphore, exchanges, symbol, details):
+    binance, okx, bybit = exchanges
+    standard_symbol = details['Standard Symbol']
+    async with semaphore:
+        spread, binance_spread, okx_spread, bybit_spread = await asyncio.gather(
+            fetch_spread(client, symbol),
+            fetch_exchange_spread(binance, standard_symbol),
+            fetch_exchange_spread(okx, standard_symbol),
+            fetch_exchange_spread(bybit, standard_symbol)
+        )
+
+    details['Spread'] = spread
+    details['Binance Spread'] = binance_spread
+    details['OKX Spread'] = okx_spread
+    details['Bybit Spread'] = bybit_spread
+
+    # Calculate spread ratios
+    details['Binance Spread Ratio'] = calculate_spread_ratio(spread, binance_spread)
+    details['OKX Spread Ratio'] = calculate_spread_ratio(spread, okx_spread)
+    details['Bybit Spread Ratio'] = calculate_spread_ratio(spread, bybit_spread)
+
+async def update_all_spreads(pairs_dict):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit_per_host=64)
+    limits = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+    # GAIA depth requests are multiplexed over one HTTP/2 connection; ccxt keeps its own aiohttp session
+    async with httpx.AsyncClient(http2=True, base_url=BASE_URL, headers={'Accept-Encoding': ACCEPT_ENCODING}, limits=limits) as client, \
+            aiohttp.ClientSession(connector=connector) as session:
+        # Initialize exchanges on the shared session so ccxt reuses kept-alive connections to each host
+        exchanges = tuple(exchange_class({'enableRateLimit': True, 'session': session}) for exchange_class in (ccxta.binance, ccxta.okx, ccxta.bybit))
+        try:
+            # Load each exchange's markets once up front instead of lazily on the first order book request;
+            # a failed load is retried lazily and reported per symbol by fetch_exchange_spread
+            await asyncio.gather(*(exchange.load_markets() for exchange in exchanges), return_exceptions=True)
+            # Every symbol's four order book requests run concurrently, bounded by the semaphore
+            await asyncio.gather(*(update_spread(client, semaphore, exchanges, symbol, details) for symbol, details in pairs_dict.items()))
+        finally:
+            for exchange in exchanges:
+                await exchange.close()
+
 if __name__ == '__main__':
     pairs_dict = fetch_pairs_list()
     
-    # Initialize exchanges
-    binance = ccxt.binance()
-    okx = ccxt.okx()
-    bybit = ccxt.bybit()
-    
     # Update spreads for each pair
-    for symbol in pairs_dict.keys():
-        spread = fetch_spread(symbol)
-        pairs_dict[symbol]['Spread'] = spread
-        
-        standard_symbol = pairs_dict[symbol]['Standard Symbol']
-        binance_spread = fetch_exchange_spread(binance, standard_symbol)
-        okx_spread = fetch_exchange_spread(okx, standard_symbol)
-        bybit_spread = fetch_exchange_spread(bybit, standard_symbol)
-        
-        pairs_dict[symbol]['Binance Spread'] = binance_spread
-        pairs_dict[symbol]['OKX Spread'] = okx_spread
-        pairs_dict[symbol]['Bybit Spread'] = bybit_spread
-        
-        # Calculate spread ratios
-        pairs_dict[symbol]['Binance Spread Ratio'] = calculate_spread_ratio(spread, binance_spread)
-        pairs_dict[symbol]['OKX Spread Ratio'] = calculate_spread_ratio(spread, okx_spread)
-        pairs_dict[symbol]['Bybit Spread Ratio'] = calculate_spread_ratio(spread, bybit_spread)
+    asyncio.run(update_all_spreads(pairs_dict))
     
     # Sort pairs by Binance Spread Ratio in descending order (numeric ratios first, then 'N/A' at the bottom)
-    sorted_pairs = dict(sorted(pairs_dict.items(), key=lambda item: (float('-inf') if item[1]['Binance Spread Ratio'] == 'N/A' else item[1]['Binance Spread Ratio']), reverse=True))
+    # The 'N/A' sentinel is resolved once per pair so the sort compares bare floats
+    sorted_pairs = [(float('-inf') if details['Binance Spread Ratio'] == 'N/A' else details['Binance Spread Ratio'], symbol, details) for symbol, details in pairs_dict.items()]
+    sorted_pairs.sort(key=operator.itemgetter(0), reverse=True)
     
     # Create a PrettyTable to display the symbols and their details
     table = PrettyTable()
     table.field_names = ["Symbol", "Base Asset", "Quote Asset", "Spread", "Standard Symbol", "Binance Spread", "OKX Spread", "Bybit Spread", "Binance Spread Ratio", "OKX Spread Ratio", "Bybit Spread Ratio"]
     
-    for symbol, details in sorted_pairs.items():
-        table.add_row([
+    table.add_rows([
+        [
             symbol, 
             details['Base Asset'], 
             details['Quote Asset'], 
@@ -128,6 +156,8 @@ if __name__ == '__main__':
             details['Binance Spread Ratio'], 
             details['OKX Spread Ratio'], 
             details['Bybit Spread Ratio']
-        ])
+        ]
+        for _, symbol, details in sorted_pairs
+    ])
     
     print(table)
\ No newline at end of file
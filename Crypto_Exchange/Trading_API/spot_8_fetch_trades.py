@@ -1,16 +1,33 @@
-import requests
-import time
+import asyncio
+import httpx
+import orjson
+from gaiaex_client import TokenBucket, create_session
 
 # Constants for user customization
 BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
+RATE_PER_SEC = 10  # Sustained request rate allowed by the exchange
+BURST_CAPACITY = 20  # Requests that may be sent back-to-back before throttling kicks in
+MAX_CONCURRENCY = 32  # Trade requests in flight at once
+MAX_RETRIES = 3  # Retries on HTTP 429 before giving up on a symbol for this cycle
+BACKOFF_BASE = 0.2  # Seconds; doubled on every consecutive 429
+POLL_INTERVAL = 1.0  # Seconds between the starts of consecutive polling cycles
+ACCEPT_ENCODING = 'gzip, br'  # Compressed trade bodies; brotli decoding needs the httpx[brotli] extra
+
+SESSION = create_session()
+
+THROTTLE = TokenBucket(RATE_PER_SEC, BURST_CAPACITY)
 
 
 def fetch_pairs_list():
     url = f"{BASE_URL}/sapi/v1/symbols"  # URL to fetch pairs list
-    response = requests.get(url)
-    
+    response = SESSION.get(url)
+
     if response.status_code == 200:
-        data = response.json()
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            print("Failed to decode pairs list:", e)
+            return []
         symbols = data.get('symbols', [])
         return [symbol['symbol'] for symbol in symbols]
     else:
@@ -18,29 +35,51 @@ def fetch_pairs_list():
         return []
 
 
-def fetch_and_print_recent_trades(symbol, limit=5):
-    trades_url = f"{BASE_URL}/api/v1/trades"
+async def fetch_and_print_recent_trades(client, symbol, limit=5):
+    trades_url = "/api/v1/trades"
     params = {'symbol': symbol, 'limit': limit}
-    
+
     try:
-        response = requests.get(trades_url, params=params)
-        if response.status_code == 200:
-            trades = response.json()
-            for trade in trades:
-                price = float(trade['price'])
-                qty = float(trade['qty'])
-                trade_time = trade['time']
-                side = trade['side']
-                print(f"Symbol: {symbol}, Price: {price}, Quantity: {qty}, Time: {trade_time}, Side: {side}")
-        else:
-            print(f"Failed to fetch recent trades for {symbol}. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
+        for attempt in range(MAX_RETRIES + 1):
+            await THROTTLE.acquire_async()
+            response = await client.get(trades_url, params=params)
+            if response.status_code == 429 and attempt < MAX_RETRIES:
+                await asyncio.sleep(BACKOFF_BASE * 2 ** attempt)
+                continue
+            if response.status_code == 200:
+                trades = orjson.loads(response.content)
+                for trade in trades:
+                    price = float(trade['price'])
+                    qty = float(trade['qty'])
+                    trade_time = trade['time']
+                    side = trade['side']
+                    print(f"Symbol: {symbol}, Price: {price}, Quantity: {qty}, Time: {trade_time}, Side: {side}")
+            else:
+                print(f"Failed to fetch recent trades for {symbol}. Status Code: {response.status_code}, Response: {response.text}")
+            return
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
         print(f"An error occurred while fetching recent trades for {symbol}: {e}")
 
 
+async def poll_recent_trades(symbols):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    limits = httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=60)
+
+    async def bounded_fetch(client, symbol):
+        async with semaphore:
+            await fetch_and_print_recent_trades(client, symbol)
+
+    # One HTTP/2 client for the whole program lifetime multiplexes every request; each cycle's requests are paced by THROTTLE
+    async with httpx.AsyncClient(http2=True, base_url=BASE_URL, headers={'Accept-Encoding': ACCEPT_ENCODING}, limits=limits) as client:
+        loop = asyncio.get_running_loop()
+        next_cycle = loop.time()
+        while True:
+            await asyncio.gather(*(bounded_fetch(client, symbol) for symbol in symbols))
+            # Cycles start on a fixed POLL_INTERVAL grid; an overrunning cycle is followed immediately
+            next_cycle += POLL_INTERVAL
+            await asyncio.sleep(max(0, next_cycle - loop.time()))
+
+
 if __name__ == '__main__':
     symbols = fetch_pairs_list()
-    while True:
-        for symbol in symbols:
-            fetch_and_print_recent_trades(symbol)
-        time.sleep(1)  # Delay between each cycle to avoid rate limit issues
+    asyncio.run(poll_recent_trades(symbols))
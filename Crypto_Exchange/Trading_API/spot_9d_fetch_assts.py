@@ -48,8 +48,7 @@ def get_assets_above_threshold(account_info, threshold=1):
         # Create and print a table of assets with free balance greater than the threshold
         table = PrettyTable()
         table.field_names = ["Asset", "Free Balance"]
-        for asset in assets_above_threshold:
-            table.add_row([asset['asset'], f"{float(asset['free']):,.8f}"])
+        table.add_rows([[asset['asset'], f"{float(asset['free']):,.8f}"] for asset in assets_above_threshold])
         
         print(table)
 
@@ -1,45 +1,12 @@
-import requests
 import json
-import hashlib
-import hmac
-import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from gaiaex_client import Client
 from prettytable import PrettyTable
 
-BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
 CONFIG_FILE = 'UID32937591.json'
-ACCOUNT_PATH = '/sapi/v1/account'
-DEPTH_PATH = '/sapi/v1/depth'
 THRESHOLD = 1
-
-# Load configuration
-def load_config(config_file):
-    with open(config_file, 'r') as file:
-        return json.load(file)
-
-# Fetch account information
-def fetch_account_info(api_key, secret_key):
-    full_url = BASE_URL + ACCOUNT_PATH
-    timestamp = int(time.time() * 1000)
-    signature_payload = f"{timestamp}GET{ACCOUNT_PATH}".encode('utf-8')
-    signature = hmac.new(secret_key.encode(), signature_payload, hashlib.sha256).hexdigest()
-
-    headers = {
-        'X-CH-APIKEY': api_key,
-        'X-CH-SIGN': signature,
-        'X-CH-TS': str(timestamp)
-    }
-
-    try:
-        response = requests.get(full_url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            return data
-        else:
-            print(f"Failed to fetch account information. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
-        print(f"An error occurred: {e}")
-
-    return None
+MAX_WORKERS = 16  # Fallback depth requests in flight at once
 
 # Convert account info to a dictionary
 def account_info_to_dict(account_info):
@@ -49,61 +16,65 @@ def account_info_to_dict(account_info):
     return {}
 
 # Fetch the best bid price for a given asset
-def fetch_best_bid(asset):
+def fetch_best_bid(client, asset):
     # Modify symbol to match the correct trading pair format
     symbol = f"{asset.lower()}usdt{asset[-4:]}"  # Assumes assets end with '1802', so we append 'usdt1802'
-    depth_url = f"{BASE_URL}{DEPTH_PATH}"
-    params = {'symbol': symbol, 'limit': 1}  # Fetching only the top bid
+    data = client.depth(symbol, limit=1)  # Fetching only the top bid
+    if data is not None:
+        if data.get('bids'):
+            return float(data['bids'][0][0])  # Return the price of the top bid
+        print(f"No bids found for {symbol}. Response: {data}")
+    return None
 
-    try:
-        response = requests.get(depth_url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('bids'):
-                return float(data['bids'][0][0])  # Return the price of the top bid
-            else:
-                print(f"No bids found for {symbol}. Response: {data}")
+# Fetch the best bid of every symbol in a single bookTicker request
+def fetch_all_best_bids(client):
+    tickers = client.book_ticker() or []
+    return {ticker['symbol'].lower(): float(ticker['bidPrice']) for ticker in tickers if ticker.get('bidPrice')}
+
+# Run every request of the program over one pooled client
+def run(config_file):
+    with Client.from_config(config_file) as client:
+        # Fetching account information
+        account_info = client.account()
+
+        # Convert account info to a dictionary and print it
+        account_dict = account_info_to_dict(account_info)
+        print("Account Information Dictionary:")
+        print(json.dumps(account_dict, indent=4))
+
+        # Display assets above a certain threshold
+        threshold = THRESHOLD
+        assets_above_threshold = {asset: balance for asset, balance in account_dict.items() if balance > threshold}
+    
+        if assets_above_threshold:
+            table = PrettyTable()
+            table.field_names = ["Asset", "Free Balance", "Bid Price", "Value (USDT)"]
+
+            # One request prices every asset; per-asset depth lookups are only a fallback for symbols missing from it
+            best_bids = fetch_all_best_bids(client)
+            # Fallback lookups are independent round-trips, so they overlap on a thread pool sharing the client's connections
+            fallback_assets = [asset for asset in assets_above_threshold if asset != "USDT1802" and not best_bids.get(f"{asset.lower()}usdt{asset[-4:]}")]
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                fallback_bids = dict(zip(fallback_assets, executor.map(partial(fetch_best_bid, client), fallback_assets)))
+
+            rows_out = []
+            for asset, balance in assets_above_threshold.items():
+                if asset == "USDT1802":
+                    bid_price = 1.0  # Use 1 for USDT1802
+                else:
+                    bid_price = best_bids.get(f"{asset.lower()}usdt{asset[-4:]}") or fallback_bids[asset]
+
+                bid_display = f"{bid_price:,.8f}" if bid_price else "N/A"
+                value = balance * bid_price if bid_price else 0
+                value_display = f"{value:,.8f}" if bid_price else "N/A"
+
+                rows_out.append([asset, f"{balance:,.8f}", bid_display, value_display])
+            table.add_rows(rows_out)
+
+            print("\nAssets Above Threshold:")
+            print(table)
         else:
-            print(f"Failed to fetch bid price for {symbol}. Status Code: {response.status_code}, Response: {response.text}")
-        return None
-    except requests.RequestException as e:
-        print(f"Error fetching bid for {symbol}: {e}")
-        return None
+            print("\nNo assets found with free balance above the threshold.")
 
 if __name__ == '__main__':
-    config = load_config(CONFIG_FILE)
-    api_key = config['GAIAEX_API_KEY']
-    secret_key = config['GAIAEX_SECRET_KEY']
-
-    # Fetching account information
-    account_info = fetch_account_info(api_key, secret_key)
-
-    # Convert account info to a dictionary and print it
-    account_dict = account_info_to_dict(account_info)
-    print("Account Information Dictionary:")
-    print(json.dumps(account_dict, indent=4))
-
-    # Display assets above a certain threshold
-    threshold = THRESHOLD
-    assets_above_threshold = {asset: balance for asset, balance in account_dict.items() if balance > threshold}
-    
-    if assets_above_threshold:
-        table = PrettyTable()
-        table.field_names = ["Asset", "Free Balance", "Bid Price", "Value (USDT)"]
-
-        for asset, balance in assets_above_threshold.items():
-            if asset == "USDT1802":
-                bid_price = 1.0  # Use 1 for USDT1802
-            else:
-                bid_price = fetch_best_bid(asset)
-
-            bid_display = f"{bid_price:,.8f}" if bid_price else "N/A"
-            value = balance * bid_price if bid_price else 0
-            value_display = f"{value:,.8f}" if bid_price else "N/A"
-
-            table.add_row([asset, f"{balance:,.8f}", bid_display, value_display])
-
-        print("\nAssets Above Threshold:")
-        print(table)
-    else:
-        print("\nNo assets found with free balance above the threshold.")
+    run(CONFIG_FILE)
\ No newline at end of file
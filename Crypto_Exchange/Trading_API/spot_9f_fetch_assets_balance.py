@@ -133,11 +133,13 @@ if __name__ == '__main__':
         table = PrettyTable()
         table.field_names = ["Asset", "Symbol", "Base Asset", "Free Balance", "Bid Price", "Value (USDT)", "Price Precision", "Quantity Precision"]
 
+        rows_out = []
         for row in rows:
             asset, symbol, base_asset, balance, bid_price, value, price_precision, quantity_precision = row
             bid_display = f"{bid_price:,.8f}" if bid_price else "N/A"
             value_display = f"{value:,.8f}" if bid_price else "N/A"
-            table.add_row([asset, symbol, base_asset, f"{balance:,.8f}", bid_display, value_display, price_precision, quantity_precision])
+            rows_out.append([asset, symbol, base_asset, f"{balance:,.8f}", bid_display, value_display, price_precision, quantity_precision])
+        table.add_rows(rows_out)
 
         print("\nAssets Above Threshold (Sorted by Value):")
         print(table)
@@ -1,139 +1,131 @@
-import requests
-import json
-import hashlib
-import hmac
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import time
+import numpy as np
+import pandas as pd
+from gaiaex_client import Client
 from prettytable import PrettyTable
 
-BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
 CONFIG_FILE = 'UID32937591.json'
-ACCOUNT_PATH = '/sapi/v1/account'
-DEPTH_PATH = '/sapi/v1/depth'
-SYMBOLS_PATH = '/sapi/v1/symbols'
 THRESHOLD = 1
+PRECISION_TTL = 300  # Seconds to reuse the parsed symbols list before refetching
+FMT8 = "{:,.8f}".format  # Bound once and reused for every numeric table cell
+MAX_WORKERS = 16  # Fallback depth requests in flight at once
 
-# Load configuration
-def load_config(config_file):
-    with open(config_file, 'r') as file:
-        return json.load(file)
-
-# Fetch account information
-def fetch_account_info(api_key, secret_key):
-    full_url = BASE_URL + ACCOUNT_PATH
-    timestamp = int(time.time() * 1000)
-    signature_payload = f"{timestamp}GET{ACCOUNT_PATH}".encode('utf-8')
-    signature = hmac.new(secret_key.encode(), signature_payload, hashlib.sha256).hexdigest()
-
-    headers = {
-        'X-CH-APIKEY': api_key,
-        'X-CH-SIGN': signature,
-        'X-CH-TS': str(timestamp)
-    }
-
-    try:
-        response = requests.get(full_url, headers=headers)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Failed to fetch account information. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
-        print(f"An error occurred: {e}")
-
-    return None
+# Symbol precision is static for a trading session, so successful fetches are reused for PRECISION_TTL seconds
+_precision_cache = {'expires': 0.0, 'data': None}
+_asset_lookup_cache = {'source': None, 'entries': {}}
+NA_PRECISION = {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}
 
 # Fetch symbol precision details and map by base asset
-def fetch_pairs_precision():
-    url = BASE_URL + SYMBOLS_PATH
-    response = requests.get(url)
+def fetch_pairs_precision(client):
+    if _precision_cache['data'] is not None and time.monotonic() < _precision_cache['expires']:
+        return _precision_cache['data']
+
+    data = client.symbols()
     precision_data = {}
     asset_to_symbol_map = {}
 
-    if response.status_code == 200:
-        data = response.json()
+    if data is not None:
         symbols = data.get('symbols', [])
         for symbol in symbols:
-            precision_data[symbol['symbol'].lower()] = {
+            precision = {
                 'pricePrecision': symbol['pricePrecision'],
                 'quantityPrecision': symbol['quantityPrecision']
             }
-            asset_to_symbol_map[symbol['baseAsset'].lower()] = {
-                'pricePrecision': symbol['pricePrecision'],
-                'quantityPrecision': symbol['quantityPrecision']
-            }
-    else:
-        print("Failed to fetch pairs list:", response.text)
+            precision_data[symbol['symbol'].lower()] = precision
+            asset_to_symbol_map[symbol['baseAsset'].lower()] = precision
+        _precision_cache['data'] = (precision_data, asset_to_symbol_map)
+        _precision_cache['expires'] = time.monotonic() + PRECISION_TTL
 
     return precision_data, asset_to_symbol_map
 
+# Map each asset to its (symbol key, base asset, precision) once; entries are reused until the precision tables refresh
+def build_asset_lookup(assets, precision_data, asset_to_symbol_map):
+    if _asset_lookup_cache['source'] is not precision_data:
+        _asset_lookup_cache['source'] = precision_data
+        _asset_lookup_cache['entries'] = {}
+    entries = _asset_lookup_cache['entries']
+    for asset in assets:
+        if asset not in entries:
+            symbol_key = f"{asset.lower()}usdt1802"
+            base_asset = asset[:-4]
+            entries[asset] = (symbol_key, base_asset, precision_data.get(symbol_key, asset_to_symbol_map.get(base_asset.lower(), NA_PRECISION)))
+    return entries
+
 # Fetch the best bid price for a given asset
-def fetch_best_bid(asset):
+def fetch_best_bid(client, asset):
     symbol = f"{asset.lower()}usdt1802"
-    depth_url = f"{BASE_URL}{DEPTH_PATH}"
-    params = {'symbol': symbol, 'limit': 1}
-
-    try:
-        response = requests.get(depth_url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('bids'):
-                return float(data['bids'][0][0])
-            else:
-                print(f"No bids found for {symbol}. Response: {data}")
-        else:
-            print(f"Failed to fetch bid price for {symbol}. Status Code: {response.status_code}, Response: {response.text}")
-        return None
-    except requests.RequestException as e:
-        print(f"Error fetching bid for {symbol}: {e}")
-        return None
-
-# Login function
-def login():
-    config = load_config(CONFIG_FILE)
-    return config['GAIAEX_API_KEY'], config['GAIAEX_SECRET_KEY']
-
-def balance_snapshot(api_key, secret_key):
-    account_info = fetch_account_info(api_key, secret_key)
+    data = client.depth(symbol, limit=1)
+    if data is not None:
+        if data.get('bids'):
+            return float(data['bids'][0][0])
+        print(f"No bids found for {symbol}. Response: {data}")
+    return None
+
+# Fetch the best bid of every symbol in a single bookTicker request
+def fetch_all_best_bids(client):
+    tickers = client.book_ticker() or []
+    return {ticker['symbol'].lower(): float(ticker['bidPrice']) for ticker in tickers if ticker.get('bidPrice')}
+
+def balance_snapshot(client):
+    account_info = client.account()
     if not account_info:
         print("Failed to fetch account information.")
         exit(1)
 
-    precision_data, asset_to_symbol_map = fetch_pairs_precision()
+    precision_data, asset_to_symbol_map = fetch_pairs_precision(client)
 
     account_dict = {balance['asset']: float(balance['free']) for balance in account_info.get('balances', [])}
-
-    rows = []
-    for asset, balance in account_dict.items():
-        symbol = f"{asset.lower()}usdt1802"
-        base_asset = asset[:-4]
-        bid_price = 1.0 if asset == "USDT1802" else fetch_best_bid(asset)
-        value = balance * bid_price if bid_price else 0
-
-        precision = precision_data.get(symbol, asset_to_symbol_map.get(base_asset.lower(), {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}))
-
-        meets_threshold = "Yes" if balance > THRESHOLD and asset.endswith("1802") else "No"
-
-        # Only include rows where the value is greater than 0.1 USDT
-        if value > 0.1:
-            rows.append([asset, symbol, base_asset, balance, bid_price, value, precision['pricePrecision'], precision['quantityPrecision'], meets_threshold])
-
-    # Sort rows by Value (USDT) in descending order
-    rows.sort(key=lambda x: x[5], reverse=True)
+    # Only non-zero "1802" assets can be priced against a usdt1802 pair, so everything else is dropped before any lookups
+    account_dict = {asset: balance for asset, balance in account_dict.items() if asset.endswith("1802") and balance > 0}
+    asset_lookup = build_asset_lookup(account_dict, precision_data, asset_to_symbol_map)
+
+    # One request prices every asset; per-asset depth lookups are only a fallback for symbols missing from it
+    best_bids = fetch_all_best_bids(client)
+
+    # Build the snapshot as columns so pricing, valuation, filtering and sorting run vectorised
+    df = pd.DataFrame(
+        [(asset, balance, *asset_lookup[asset]) for asset, balance in account_dict.items()],
+        columns=['asset', 'balance', 'symbol', 'base_asset', 'precision']
+    )
+    df['bid_price'] = df['symbol'].map(best_bids)
+    df.loc[df['asset'] == "USDT1802", 'bid_price'] = 1.0
+    missing = df['bid_price'].isna()
+    if missing.any():
+        # Fallback lookups are independent round-trips, so they overlap on a thread pool sharing the client's connections
+        fallback_assets = df.loc[missing, 'asset']
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            fallback_bids = list(executor.map(partial(fetch_best_bid, client), fallback_assets))
+        df.loc[missing, 'bid_price'] = pd.Series(fallback_bids, index=fallback_assets.index, dtype=float)
+    df['bid_price'] = df['bid_price'].astype(float)
+    df['value'] = (df['balance'] * df['bid_price']).fillna(0)
+    df['meets_threshold'] = np.where(df['balance'] > THRESHOLD, "Yes", "No")
+
+    # Only include rows where the value is greater than 0.1 USDT, sorted by Value (USDT) in descending order
+    df = df[df['value'] > 0.1].sort_values('value', ascending=False)
 
     # Create PrettyTable
     table = PrettyTable()
     table.field_names = ["Asset", "Symbol", "Base Asset", "Free Balance", "Bid Price", "Value (USDT)", "Price Precision", "Quantity Precision", "Meets Threshold"]
 
-    for row in rows:
-        asset, symbol, base_asset, balance, bid_price, value, price_precision, quantity_precision, meets_threshold = row
-        bid_display = f"{bid_price:,.8f}" if bid_price else "N/A"
-        value_display = f"{value:,.8f}" if bid_price else "N/A"
-        table.add_row([asset, symbol, base_asset, f"{balance:,.8f}", bid_display, value_display, price_precision, quantity_precision, meets_threshold])
+    # Format each display column in one pass and hand every row to PrettyTable at once
+    df['price_precision'] = df['precision'].str.get('pricePrecision')
+    df['quantity_precision'] = df['precision'].str.get('quantityPrecision')
+    for column in ('balance', 'bid_price', 'value'):
+        df[column] = df[column].map(FMT8)
+    table.add_rows(df[['asset', 'symbol', 'base_asset', 'balance', 'bid_price', 'value', 'price_precision', 'quantity_precision', 'meets_threshold']].values.tolist())
 
     print("\nAssets with Value > 0.1 USDT (Sorted by Value):")
     print(table)
 
 
+# Run every request of the program over one pooled client
+def run(config_file):
+    with Client.from_config(config_file) as client:
+        balance_snapshot(client)
+
+
 # Main execution
 if __name__ == '__main__':
-    api_key, secret_key = login()
-    balance_snapshot(api_key, secret_key)
+    run(CONFIG_FILE)
\ No newline at end of file
@@ -1,92 +1,105 @@
-import requests
-import json
-import hashlib
-import hmac
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import pandas as pd
+from gaiaex_client import Client
 from prettytable import PrettyTable
 
 # Constants
-BASE_URL = 'https://openapi.gaiaex.com'
 CONFIG_FILE = 'UID32937591.json'
-ACCOUNT_PATH = '/sapi/v1/account'
-DEPTH_PATH = '/sapi/v1/depth'
-SYMBOLS_PATH = '/sapi/v1/symbols'
 THRESHOLD = 1  # Minimum balance threshold
+PRECISION_TTL = 300  # Seconds to reuse the parsed symbols list before refetching
+FMT8 = "{:,.8f}".format  # Bound once and reused for every numeric table cell
+MAX_WORKERS = 16  # Fallback depth requests in flight at once
 
-# Load configuration
-def load_config(file_path):
-    with open(file_path, 'r') as file:
-        return json.load(file)
-
-# Generate API signature
-def generate_signature(secret_key, payload):
-    return hmac.new(secret_key.encode(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
-
-# Fetch account balances
-def fetch_account_info(api_key, secret_key):
-    timestamp = int(time.time() * 1000)
-    signature_payload = f"{timestamp}GET{ACCOUNT_PATH}"
-    signature = generate_signature(secret_key, signature_payload)
-    headers = {'X-CH-APIKEY': api_key, 'X-CH-SIGN': signature, 'X-CH-TS': str(timestamp)}
-    response = requests.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
-    return response.json() if response.status_code == 200 else None
+# Successful precision fetches are reused for PRECISION_TTL seconds
+_precision_cache = {'expires': 0.0, 'data': None}
+_asset_lookup_cache = {'source': None, 'entries': {}}
+NA_PRECISION = {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}
 
 # Fetch precision and mappings for pairs
-def fetch_pairs_precision():
-    response = requests.get(f"{BASE_URL}{SYMBOLS_PATH}")
-    if response.status_code != 200:
+def fetch_pairs_precision(client):
+    if _precision_cache['data'] is not None and time.monotonic() < _precision_cache['expires']:
+        return _precision_cache['data']
+    data = client.symbols()
+    if data is None:
         return {}, {}
-    data = response.json().get('symbols', [])
-    precision_data = {s['symbol'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    asset_to_symbol_map = {s['baseAsset'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
+    precision_data, asset_to_symbol_map = {}, {}
+    for s in data.get('symbols', []):
+        precision_data[s['symbol'].lower()] = asset_to_symbol_map[s['baseAsset'].lower()] = {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']}
+    _precision_cache['data'] = (precision_data, asset_to_symbol_map)
+    _precision_cache['expires'] = time.monotonic() + PRECISION_TTL
     return precision_data, asset_to_symbol_map
 
+# Map each asset to its (symbol key, base asset, precision) once; entries are reused until the precision tables refresh
+def build_asset_lookup(assets, precision_data, asset_to_symbol_map):
+    if _asset_lookup_cache['source'] is not precision_data:
+        _asset_lookup_cache['source'] = precision_data
+        _asset_lookup_cache['entries'] = {}
+    entries = _asset_lookup_cache['entries']
+    for asset in assets:
+        if asset not in entries:
+            symbol_key = f"{asset.lower()}usdt1802"
+            base_asset = asset[:-4]
+            entries[asset] = (symbol_key, base_asset, precision_data.get(symbol_key, asset_to_symbol_map.get(base_asset.lower(), NA_PRECISION)))
+    return entries
+
 # Fetch best bid price
-def fetch_best_bid(asset):
-    response = requests.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
-    bids = response.json().get('bids', []) if response.status_code == 200 else []
+def fetch_best_bid(client, asset):
+    data = client.depth(f"{asset.lower()}usdt1802", limit=1)
+    bids = data.get('bids', []) if data else []
     return float(bids[0][0]) if bids else None
 
+# Fetch best bid prices for all symbols in one request
+def fetch_all_best_bids(client):
+    tickers = client.book_ticker() or []
+    return {t['symbol'].lower(): float(t['bidPrice']) for t in tickers if t.get('bidPrice')}
+
 # Create a snapshot of balances
-def balance_snapshot(api_key, secret_key):
-    account_info = fetch_account_info(api_key, secret_key)
+def balance_snapshot(client):
+    account_info = client.account()
     if not account_info:
         return
 
-    precision_data, asset_to_symbol_map = fetch_pairs_precision()
+    precision_data, asset_to_symbol_map = fetch_pairs_precision(client)
     account_balances = {b['asset']: float(b['free']) for b in account_info.get('balances', [])}
+    asset_lookup = build_asset_lookup(account_balances, precision_data, asset_to_symbol_map)
+    best_bids = fetch_all_best_bids(client)
 
-    rows = []
-    for asset, balance in account_balances.items():
-        if not asset.endswith("1802") or balance <= THRESHOLD:
-            continue
-        bid_price = fetch_best_bid(asset) if asset != "USDT1802" else 1.0
-        value = balance * bid_price if bid_price else 0
-        precision = precision_data.get(f"{asset.lower()}usdt1802", asset_to_symbol_map.get(asset[:-4].lower(), {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}))
-        rows.append({
-            "Asset": asset,
-            "Symbol": f"{asset.lower()}usdt1802",
-            "Free Balance": f"{balance:,.8f}",
-            "Bid Price": f"{bid_price:,.8f}" if bid_price else "N/A",
-            "Value (USDT)": f"{value:,.8f}" if value else "N/A",
-            "Price Precision": precision['pricePrecision'],
-            "Quantity Precision": precision['quantityPrecision']
-        })
-
-    # Sort rows by Value in descending order
-    rows.sort(key=lambda x: float(x["Value (USDT)"].replace(',', '')) if x["Value (USDT)"] != "N/A" else 0, reverse=True)
+    # Vectorised snapshot: eligible balances, priced, valued and sorted as columns
+    df = pd.DataFrame(
+        [(asset, balance, asset_lookup[asset][0], asset_lookup[asset][2]) for asset, balance in account_balances.items() if asset.endswith("1802") and balance > THRESHOLD],
+        columns=['asset', 'balance', 'symbol', 'precision']
+    )
+    df['bid_price'] = df['symbol'].map(best_bids).astype(float)
+    df.loc[df['asset'] == "USDT1802", 'bid_price'] = 1.0
+    missing = df['bid_price'].isna()
+    if missing.any():
+        # Fallback lookups are independent round-trips, so they overlap on a thread pool sharing the client's connections
+        fallback_assets = df.loc[missing, 'asset']
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            fallback_bids = list(executor.map(partial(fetch_best_bid, client), fallback_assets))
+        df.loc[missing, 'bid_price'] = pd.Series(fallback_bids, index=fallback_assets.index, dtype=float)
+    df['value'] = (df['balance'] * df['bid_price'].astype(float)).fillna(0)
+    df = df.sort_values('value', ascending=False)
 
     # Display the data in a PrettyTable
     table = PrettyTable(field_names=["Asset", "Symbol", "Free Balance", "Bid Price", "Value (USDT)", "Price Precision", "Quantity Precision"])
-    for row in rows:
-        table.add_row([row[field] for field in table.field_names])
+    df['price_precision'] = df['precision'].str.get('pricePrecision')
+    df['quantity_precision'] = df['precision'].str.get('quantityPrecision')
+    df['bid_price'] = df['bid_price'].map(FMT8).where(df['bid_price'].notna(), "N/A")
+    df['value'] = df['value'].map(FMT8).where(df['value'] != 0, "N/A")
+    df['balance'] = df['balance'].map(FMT8)
+    table.add_rows(df[['asset', 'symbol', 'balance', 'bid_price', 'value', 'price_precision', 'quantity_precision']].values.tolist())
 
     print("\nAssets with Value > 1 USDT:")
     print(table)
 
+# Run every request of the program over one pooled client
+def run(config_file):
+    with Client.from_config(config_file) as client:
+        balance_snapshot(client)
+
 # Main execution
 if __name__ == '__main__':
-    credentials = load_config(CONFIG_FILE)
-    api_key = credentials['GAIAEX_API_KEY']
-    secret_key = credentials['GAIAEX_SECRET_KEY']
-    balance_snapshot(api_key, secret_key)
+    run(CONFIG_FILE)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import requests
 import json
+import orjson
 import hashlib
 import hmac
 import time
@@ -59,9 +60,14 @@ def fetch_pairs_precision():
     response = requests.get(f"{BASE_URL}{SYMBOLS_PATH}")
     if response.status_code != 200:
         return {}, {}
-    data = response.json().get('symbols', [])
-    precision_data = {s['symbol'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    asset_to_symbol_map = {s['baseAsset'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
+    try:
+        data = orjson.loads(response.content).get('symbols', [])
+    except orjson.JSONDecodeError:
+        return {}, {}
+    # One pass fills both maps, sharing a single precision dict per symbol
+    precision_data, asset_to_symbol_map = {}, {}
+    for s in data:
+        precision_data[s['symbol'].lower()] = asset_to_symbol_map[s['baseAsset'].lower()] = {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']}
     return precision_data, asset_to_symbol_map
 
 def fetch_best_bid(asset):
@@ -114,12 +120,14 @@ def balance_snapshot(api_key, secret_key):
     table.field_names = ["Asset", "Symbol", "Base Asset", "Free Balance", "Bid Price", "Value (USDT)", 
                         "Price Precision", "Quantity Precision", "Meets Threshold"]
 
+    rows_out = []
     for row in rows:
         asset, symbol, base_asset, balance, bid_price, value, price_precision, quantity_precision, meets_threshold = row
         bid_display = f"{bid_price:,.8f}" if bid_price else "N/A"
         value_display = f"{value:,.1f}" if bid_price else "N/A"  # Format Value (USDT) to 1 decimal place
-        table.add_row([asset, symbol, base_asset, f"{balance:,.8f}", bid_display, value_display, 
+        rows_out.append([asset, symbol, base_asset, f"{balance:,.8f}", bid_display, value_display, 
                     price_precision, quantity_precision, meets_threshold])
+    table.add_rows(rows_out)
 
     print("\nAssets with Value > 0.1 USDT (Sorted by Value):")
     print(table)
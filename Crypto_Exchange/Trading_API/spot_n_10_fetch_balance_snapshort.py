@@ -1,5 +1,6 @@
 import requests
 import json
+import orjson
 import hashlib
 import hmac
 import time
@@ -31,22 +32,24 @@ def fetch_account_info(api_key, secret_key):
     signature = generate_signature(secret_key, signature_payload)
     headers = {'X-CH-APIKEY': api_key, 'X-CH-SIGN': signature, 'X-CH-TS': str(timestamp)}
     response = requests.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
-    return response.json() if response.status_code == 200 else None
+    return orjson.loads(response.content) if response.status_code == 200 else None
 
 # Fetch precision and mappings for pairs
 def fetch_pairs_precision():
     response = requests.get(f"{BASE_URL}{SYMBOLS_PATH}")
     if response.status_code != 200:
         return {}, {}
-    data = response.json().get('symbols', [])
-    precision_data = {s['symbol'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    asset_to_symbol_map = {s['baseAsset'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
+    data = orjson.loads(response.content).get('symbols', [])
+    # One pass fills both maps, sharing a single precision dict per symbol
+    precision_data, asset_to_symbol_map = {}, {}
+    for s in data:
+        precision_data[s['symbol'].lower()] = asset_to_symbol_map[s['baseAsset'].lower()] = {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']}
     return precision_data, asset_to_symbol_map
 
 # Fetch best bid price
 def fetch_best_bid(asset):
     response = requests.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
-    bids = response.json().get('bids', []) if response.status_code == 200 else []
+    bids = orjson.loads(response.content).get('bids', []) if response.status_code == 200 else []
     return float(bids[0][0]) if bids else None
 
 # Create a snapshot of balances
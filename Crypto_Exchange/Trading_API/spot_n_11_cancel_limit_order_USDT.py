@@ -1,90 +1,83 @@
-import requests
 import json
-import hashlib
-import hmac
+import orjson
 import time
 import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from gaiaex_client import TokenBucket, create_session, load_config, make_signer
 
 # Constants
 BASE_URL = "https://openapi.gaiaex.com"
 CONFIG_FILE = 'UID32751170.json' 
 # CONFIG_FILE = "UID32937591.json"
 CANCEL_ORDER_PATH = "/sapi/v1/cancel"
+MAX_WORKERS = 10  # Cancel requests in flight at once
+CANCEL_RATE_PER_SEC = 10  # Sustained cancel rate allowed by the exchange
+CANCEL_BURST = 5  # Cancels that may be sent back-to-back before pacing kicks in
 
-# Logging configuration
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-
-def load_config(file_path):
-    """Load API credentials from a JSON file."""
-    try:
-        with open(file_path, "r") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        logging.error("Configuration file not found: %s", file_path)
-        return None
-    except json.JSONDecodeError:
-        logging.error("Error decoding JSON from configuration file: %s", file_path)
-        return None
-
-
-def generate_signature(secret_key, payload):
-    """Generate HMAC SHA256 signature."""
-    return hmac.new(secret_key.encode(), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+SESSION = create_session()
 
+# Shared by every worker thread so concurrent cancels stay within the exchange rate limit
+CANCEL_BUCKET = TokenBucket(rate_per_sec=CANCEL_RATE_PER_SEC, capacity=CANCEL_BURST)
 
-def create_headers(api_key, secret_key, payload):
-    """Create request headers with the correct signature."""
-    timestamp = str(int(time.time() * 1000))
-    signature_payload = f"{timestamp}POST{CANCEL_ORDER_PATH}{payload}"
-    signature = generate_signature(secret_key, signature_payload)
-
-    return {
-        "X-CH-APIKEY": api_key,
-        "X-CH-SIGN": signature,
-        "X-CH-TS": timestamp,
-        "Content-Type": "application/json",
-    }
+# Logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
-def cancel_order(api_key, secret_key, order_id, symbol):
-    """Cancel a specific order using the symbol field."""
-    timestamp = str(int(time.time() * 1000))
-    payload = json.dumps(
+def cancel_order(session, sign_post, order_id, symbol):
+    """Cancel a specific order using the symbol field and return the parsed API response."""
+    CANCEL_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
+    timestamp = str(time.time_ns() // 1_000_000)
+    # Compact bytes body: signed and sent as-is, with no re-encoding
+    payload = orjson.dumps(
         {
             "orderId": order_id,
             "symbol": symbol,
             "timestamp": timestamp,
             "recvWindow": 5000,
-        },
-        indent=4,
+        }
     )
 
-    headers = create_headers(api_key, secret_key, payload)
+    headers = sign_post(CANCEL_ORDER_PATH, payload, timestamp)
     url = f"{BASE_URL}{CANCEL_ORDER_PATH}"
 
-    logging.info("Sending request to %s", url)
-    logging.info("Request Headers: %s", json.dumps(headers, indent=4))
-    logging.info("JSON Payload:\n%s", payload)
+    logging.info("Sending cancel for order %s to %s", order_id, url)
+    # Pretty-printed dumps are only built when DEBUG output is actually enabled
+    verbose = logging.getLogger().isEnabledFor(logging.DEBUG)
+    if verbose:
+        logging.debug("Request Headers: %s", json.dumps(headers, indent=4))
+        logging.debug("JSON Payload:\n%s", payload.decode())
 
-    response = requests.post(url, headers=headers, data=payload)
+    try:
+        response = session.post(url, headers=headers, data=payload)
+    except requests.RequestException as e:
+        logging.error("An error occurred while cancelling order %s: %s", order_id, e)
+        return {"error": str(e)}
 
     try:
-        response_data = response.json()
-    except json.JSONDecodeError:
+        response_data = orjson.loads(response.content)
+    except orjson.JSONDecodeError:
         response_data = {"error": "Invalid JSON response", "raw_response": response.text}
 
-    logging.info("API Response:\n%s", json.dumps(response_data, indent=4))
+    if verbose:
+        logging.debug("API Response:\n%s", json.dumps(response_data, indent=4))
 
     if response.status_code == 200:
         logging.info("Order %s cancelled successfully.", order_id)
     else:
         logging.error("Failed to cancel order %s. API response: %s", order_id, response.text)
+    return response_data
 
 
 if __name__ == "__main__":
-    credentials = load_config(CONFIG_FILE)
-    if not credentials:
+    try:
+        credentials = load_config(CONFIG_FILE)
+    except FileNotFoundError:
+        logging.error("Configuration file not found: %s", CONFIG_FILE)
+        exit(1)
+    except json.JSONDecodeError:
+        logging.error("Error decoding JSON from configuration file: %s", CONFIG_FILE)
         exit(1)
 
     api_key = credentials.get("GAIAEX_API_KEY", "").strip()
@@ -99,6 +92,10 @@ if __name__ == "__main__":
         # ("2625041525564385985", "usdc1802usdt1802"),
     ]
 
-    for order_id, symbol in order_ids:
-        logging.info("Cancelling order %s for symbol %s...", order_id, symbol)
-        cancel_order(api_key, secret_key, order_id, symbol)
+    # Cancels go out concurrently over the shared session; CANCEL_BUCKET paces them
+    cancel = partial(cancel_order, SESSION, make_signer(api_key, secret_key))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(cancel, *zip(*order_ids)))
+
+    failed = sum(1 for result in results if "error" in result)
+    logging.info("Processed %d cancel requests, %d failed to send or parse.", len(results), failed)
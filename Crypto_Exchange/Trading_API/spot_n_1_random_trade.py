@@ -1,5 +1,6 @@
 import requests
 import json
+import orjson
 import hashlib
 import hmac
 import time
@@ -43,10 +44,10 @@ def fetch_account_info(api_key, secret_key):
     try:
         response = requests.get(full_url, headers=headers)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             print(f"Failed to fetch account information. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"An error occurred: {e}")
     return None
 
@@ -57,7 +58,7 @@ def fetch_pairs_precision():
     precision_data = {}
 
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         symbols = data.get('symbols', [])
         for symbol in symbols:
             precision_data[symbol['symbol'].lower()] = {
@@ -78,7 +79,7 @@ def fetch_best_bid(asset):
     try:
         response = requests.get(depth_url, params=params)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get('bids'):
                 return float(data['bids'][0][0])
             else:
@@ -86,7 +87,7 @@ def fetch_best_bid(asset):
         else:
             print(f"Failed to fetch bid price for {symbol}. Status Code: {response.status_code}, Response: {response.text}")
         return None
-    except requests.RequestException as e:
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching bid for {symbol}: {e}")
         return None
 
@@ -118,11 +119,11 @@ def place_spot_market_order(api_key, secret_key, symbol_name, volume, side, orde
     try:
         response = requests.post(full_url, headers=headers, data=body)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"Spot market order placed successfully: {data}")
         else:
             print(f"Failed to place spot market order. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"An error occurred: {e}")
 
 # Functional Modules
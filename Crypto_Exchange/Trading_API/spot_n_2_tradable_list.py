@@ -1,22 +1,4 @@
-import requests
-
-def fetch_tradable_symbols():
-    """Fetch trading pairs and format them into tradable symbol names."""
-    url = 'https://openapi.gaiaex.com/sapi/v1/symbols'  # URL to fetch pairs list
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        symbols = data.get('symbols', [])
-        tradable_symbols = [
-            f"{symbol['baseAsset']}/{symbol['quoteAsset']}"  # Convert to 'Base/Quote' format
-            for symbol in symbols
-            if symbol['quoteAsset'].upper() == 'USDT'  # Filter for USDT pairs only (if needed)
-        ]
-        return tradable_symbols
-    else:
-        print("Failed to fetch pairs list:", response.text)
-        return []
+from gaiaex_meta import fetch_tradable_symbols
 
 if __name__ == '__main__':
     tradable_list = fetch_tradable_symbols()
@@ -1,8 +1,7 @@
 import requests
-import json
-import hashlib
-import hmac
+import orjson
 import time
+from gaiaex_client import TokenBucket, create_session, load_config, signed_post
 
 # Constants for user customization
 CONFIG_FILE = 'UID32937591.json'
@@ -13,17 +12,18 @@ TOTAL_VOLUME = 4.88  # Total amount to buy/sell
 SIDE = 'SELL'  # BUY or SELL
 ORDER_TYPE = 'MARKET'  # Order type
 ORDER_COUNT = 5  # Number of market orders to be placed
+DEBUG = False  # Print the signed headers and body of every order request
 
-def load_config(config_file):
-    """Load API configuration from a JSON file."""
-    with open(config_file, 'r') as file:
-        return json.load(file)
+SESSION = create_session()
+
+ORDER_BUCKET = TokenBucket.for_orders()
 
 def place_spot_market_order(api_key, secret_key, symbol_name, volume, side, order_type='MARKET', recv_window=5000):
     """Place a spot market order using the API."""
     full_url = BASE_URL + REQUEST_PATH
     print(full_url)
-    timestamp = int(time.time() * 1000)
+    ORDER_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
+    timestamp = time.time_ns() // 1_000_000
     
     params = {
         'symbolName': symbol_name,  # Use symbolName with slash
@@ -33,25 +33,18 @@ def place_spot_market_order(api_key, secret_key, symbol_name, volume, side, orde
         'timestamp': timestamp,
         'recvWindow': recv_window
     }
-    body = json.dumps(params)
+    body = orjson.dumps(params)  # Signed and sent as the same bytes
 
     # Creating the signature based on the documentation
-    signature_payload = f"{timestamp}POST{REQUEST_PATH}{body}".encode('utf-8')
-    signature = hmac.new(secret_key.encode(), signature_payload, hashlib.sha256).hexdigest()
-    
-    headers = {
-        'X-CH-APIKEY': api_key,
-        'X-CH-SIGN': signature,
-        'X-CH-TS': str(timestamp),
-        'Content-Type': 'application/json'
-    }
+    headers = signed_post(api_key, secret_key, REQUEST_PATH, body, timestamp)
 
     try:
-        print(f"Request Headers: {headers}")
-        print(f"Request Body: {body}")  # Log request body for debugging
-        response = requests.post(full_url, headers=headers, data=body)
+        if DEBUG:
+            print(f"Request Headers: {headers}")
+            print(f"Request Body: {body.decode()}")  # Log request body for debugging
+        response = SESSION.post(full_url, headers=headers, data=body)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"Spot market order placed successfully: {data}")
         else:
             print(f"Failed to place spot market order. Status Code: {response.status_code}, Response: {response.text}")
@@ -70,4 +63,3 @@ if __name__ == '__main__':
     for i in range(ORDER_COUNT):
         print(f"Placing order {i + 1} of {ORDER_COUNT}")
         place_spot_market_order(api_key, secret_key, symbol_name=SYMBOL_NAME, volume=per_order_volume, side=SIDE, order_type=ORDER_TYPE)
-        time.sleep(1)  # Optional delay between orders to avoid rate limit issues
@@ -1,10 +1,19 @@
+import asyncio
 import requests
 import json
-import hashlib
-import hmac
+import orjson
 import time
 from prettytable import PrettyTable
 import random
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from gaiaex_client import TokenBucket, create_session, load_config, signed_headers, signed_post
+from gaiaex_meta import SymbolCatalog, truncate
+
+try:
+    import httpx
+except ImportError:  # Without httpx the fallback bids go through the thread pool over SESSION
+    httpx = None
 
 
 RANDOM_TRADE_COUNT = 20
@@ -13,7 +22,7 @@ CONFIG_FILE = 'UID32937591.json'
 BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
 ACCOUNT_PATH = '/sapi/v1/account'
 DEPTH_PATH = '/sapi/v1/depth'
-SYMBOLS_PATH = '/sapi/v1/symbols'
+BOOK_TICKER_PATH = '/sapi/v1/ticker/bookTicker'
 REQUEST_PATH = '/sapi/v1/order'  # Request path for placing a new spot order
 SYMBOL_NAME = 'BTC/USDT'  # Updated symbol name for the currency pair
 TOTAL_VOLUME = 10000  # Total amount to buy/sell
@@ -21,95 +30,102 @@ SIDE = 'BUY'  # BUY or SELL
 ORDER_TYPE = 'MARKET'  # Order type
 ORDER_COUNT = 5  # Number of market orders to be placed
 THRESHOLD = 1  # Minimum balance threshold
+MAX_WORKERS = 16  # Fallback best-bid requests in flight at once
+MAX_CONNECTIONS = 20  # HTTP/2 connections the async fallback may open
+DEBUG = False  # Print the signed headers and body of every order request
 
+SESSION = create_session()
 
-def load_config(config_file):
-    """Load API configuration from a JSON file."""
-    with open(config_file, 'r') as file:
-        return json.load(file)
-
-def generate_signature(secret_key, payload):
-    """Generate HMAC signature for GET requests."""
-    return hmac.new(secret_key.encode(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
-
-def generate_signature_post(secret_key, timestamp, body):
-    """Generate HMAC signature for POST requests."""
-    signature_payload = f"{timestamp}POST{REQUEST_PATH}{body}".encode('utf-8')
-    return hmac.new(secret_key.encode(), signature_payload, hashlib.sha256).hexdigest()
+ORDER_BUCKET = TokenBucket.for_orders()
 
-def create_headers(api_key, secret_key, timestamp, body):
-    """Create headers for the API request."""
-    signature = generate_signature_post(secret_key, timestamp, body)
-    return {
-        'X-CH-APIKEY': api_key,
-        'X-CH-SIGN': signature,
-        'X-CH-TS': str(timestamp),
-        'Content-Type': 'application/json'
-    }
 
 def fetch_account_info(api_key, secret_key):
     """Fetch account balances."""
-    timestamp = int(time.time() * 1000)
-    signature_payload = f"{timestamp}GET{ACCOUNT_PATH}"
-    signature = generate_signature(secret_key, signature_payload)
-    headers = {'X-CH-APIKEY': api_key, 'X-CH-SIGN': signature, 'X-CH-TS': str(timestamp)}
-    response = requests.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
-    return response.json() if response.status_code == 200 else None
-
-def fetch_pairs_precision():
-    """Fetch precision and mappings for trading pairs."""
-    response = requests.get(f"{BASE_URL}{SYMBOLS_PATH}")
-    if response.status_code != 200:
-        return {}, {}
-    data = response.json().get('symbols', [])
-    precision_data = {s['symbol'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    asset_to_symbol_map = {s['baseAsset'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    return precision_data, asset_to_symbol_map
+    headers = signed_headers(api_key, secret_key, 'GET', ACCOUNT_PATH)
+    response = SESSION.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
+    return orjson.loads(response.content) if response.status_code == 200 else None
 
 def fetch_best_bid(asset):
     """Fetch the best bid price for an asset."""
-    response = requests.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
-    bids = response.json().get('bids', []) if response.status_code == 200 else []
+    response = SESSION.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
+    bids = orjson.loads(response.content).get('bids', []) if response.status_code == 200 else []
+    return float(bids[0][0]) if bids else None
+
+async def fetch_best_bid_async(client, asset):
+    """Fetch the best bid price for an asset over a shared async client."""
+    response = await client.get(DEPTH_PATH, params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
+    bids = orjson.loads(response.content).get('bids', []) if response.status_code == 200 else []
     return float(bids[0][0]) if bids else None
 
-def balance_snapshot(api_key, secret_key):
+async def fetch_best_bids(assets):
+    """Fetch the best bids of many assets concurrently, multiplexed over HTTP/2."""
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    async with httpx.AsyncClient(http2=True, base_url=BASE_URL, limits=limits) as client:
+        return dict(zip(assets, await asyncio.gather(*(fetch_best_bid_async(client, asset) for asset in assets))))
+
+def fetch_all_best_bids():
+    """Fetch the best bid of every symbol in a single bookTicker request; {} on any failure, so callers fall back to depth."""
+    try:
+        response = SESSION.get(f"{BASE_URL}{BOOK_TICKER_PATH}")
+        tickers = orjson.loads(response.content) if response.status_code == 200 else []
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        print(f"An error occurred while fetching book tickers: {e}")
+        return {}
+    if not isinstance(tickers, list):  # An error payload
+        print(f"Unexpected book tickers response: {tickers}")
+        return {}
+    return {t['symbol'].lower(): float(t['bidPrice']) for t in tickers if t.get('bidPrice')}
+
+def balance_snapshot(api_key, secret_key, catalog):
     account_info = fetch_account_info(api_key, secret_key)
     if not account_info:
         print("Failed to fetch account information.")
         exit(1)
 
-    precision_data, asset_to_symbol_map = fetch_pairs_precision()
+    precision_data, asset_to_symbol_map = catalog.precision_data, catalog.asset_to_symbol_map
 
     account_dict = {balance['asset']: float(balance['free']) for balance in account_info.get('balances', [])}
 
-    rows = []
-    for asset, balance in account_dict.items():
-        symbol = f"{asset.lower()}usdt1802"
-        base_asset = asset[:-4]
-        bid_price = 1.0 if asset == "USDT1802" else fetch_best_bid(asset)
-        value = balance * bid_price if bid_price else 0
+    # Symbol and base-asset keys are derived once per asset and shared by the bid and precision lookups
+    keymap = {asset: (f"{asset.lower()}usdt1802", asset[:-4], asset[:-4].lower()) for asset in account_dict}
+
+    # One request prices every asset; per-asset depth lookups only cover non-empty balances missing from it,
+    # and go out together over one HTTP/2 client (or a thread pool sharing SESSION without httpx)
+    best_bids = fetch_all_best_bids()
+    bids = {asset: best_bids.get(keymap[asset][0]) for asset in account_dict if asset != "USDT1802"}
+    missing = [asset for asset, bid in bids.items() if not bid and account_dict[asset] > 0]
+    if missing and httpx is not None:
+        bids.update(asyncio.run(fetch_best_bids(missing)))
+    elif missing:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            bids.update(zip(missing, executor.map(fetch_best_bid, missing)))
 
-        precision = precision_data.get(symbol, asset_to_symbol_map.get(base_asset.lower(), {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}))
+    bids["USDT1802"] = 1.0  # The quote asset is priced at par, so no row needs a special case below
 
-        meets_threshold = "Yes" if balance > THRESHOLD and asset.endswith("1802") else "No"
+    # Valuation, filtering and sorting run on arrays; Python only touches the rows that are printed
+    assets = list(account_dict)
+    balances = np.fromiter(account_dict.values(), dtype=np.float64, count=len(assets))
+    bid_prices = np.fromiter((bids.get(asset) or np.nan for asset in assets), dtype=np.float64, count=len(assets))
+    values = balances * bid_prices  # Unpriced assets stay NaN and fail the filter below
 
-        # Only include rows where the value is greater than 0.1 USDT
-        if value > 0.1:
-            rows.append([asset, symbol, base_asset, balance, bid_price, value, precision['pricePrecision'], precision['quantityPrecision'], meets_threshold])
+    # Only include rows where the value is greater than 0.1 USDT, sorted by Value (USDT) in descending order
+    keep = np.flatnonzero(values > 0.1)
+    order = keep[np.argsort(-values[keep], kind='stable')]
 
-    # Sort rows by Value (USDT) in descending order
-    rows.sort(key=lambda x: x[5], reverse=True)
     # Create PrettyTable
     table = PrettyTable()
     table.field_names = ["Asset", "Symbol", "Base Asset", "Free Balance", "Bid Price", "Value (USDT)", 
                         "Price Precision", "Quantity Precision", "Meets Threshold"]
 
-    for row in rows:
-        asset, symbol, base_asset, balance, bid_price, value, price_precision, quantity_precision, meets_threshold = row
-        bid_display = f"{bid_price:,.8f}" if bid_price else "N/A"
-        value_display = f"{value:,.1f}" if bid_price else "N/A"  # Format Value (USDT) to 1 decimal place
-        table.add_row([asset, symbol, base_asset, f"{balance:,.8f}", bid_display, value_display, 
-                    price_precision, quantity_precision, meets_threshold])
+    rows = []
+    for i in order:
+        asset = assets[i]
+        symbol, base_asset, base_key = keymap[asset]
+        price_precision, quantity_precision = precision_data.get(symbol, asset_to_symbol_map.get(base_key, ('N/A', 'N/A')))
+        meets_threshold = "Yes" if balances[i] > THRESHOLD and asset.endswith("1802") else "No"
+        rows.append([asset, symbol, base_asset, f"{balances[i]:,.8f}", f"{bid_prices[i]:,.8f}", f"{values[i]:,.1f}",  # Format Value (USDT) to 1 decimal place
+                     price_precision, quantity_precision, meets_threshold])
+    table.add_rows(rows)
 
     print("\nAssets with Value > 0.1 USDT (Sorted by Value):")
     print(table)
@@ -121,7 +137,8 @@ def place_market_orders(api_key, secret_key, symbol_name, total_volume, side, or
 
     for i in range(order_count):
         print(f"Placing order {i + 1} of {order_count}")
-        timestamp = int(time.time() * 1000)
+        ORDER_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
+        timestamp = time.time_ns() // 1_000_000
 
         params = {
             'symbolName': symbol_name,  # Use symbolName with slash
@@ -131,49 +148,30 @@ def place_market_orders(api_key, secret_key, symbol_name, total_volume, side, or
             'timestamp': timestamp,
             'recvWindow': 5000
         }
-        body = json.dumps(params)
-        headers = create_headers(api_key, secret_key, timestamp, body)
+        body = orjson.dumps(params)  # Signed and sent as the same bytes
+        headers = signed_post(api_key, secret_key, REQUEST_PATH, body, timestamp)
 
         try:
-            print(f"Request Headers: {headers}")
-            print(f"Request Body: {body}")  # Log request body for debugging
-            response = requests.post(full_url, headers=headers, data=body)
+            if DEBUG:
+                print(f"Request Headers: {headers}")
+                print(f"Request Body: {body.decode()}")  # Log request body for debugging
+            response = SESSION.post(full_url, headers=headers, data=body)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"Order {i + 1} placed successfully: {data}")
             else:
                 print(f"Failed to place order {i + 1}. Status Code: {response.status_code}, Response: {response.text}")
         except requests.RequestException as e:
             print(f"An error occurred while placing order {i + 1}: {e}")
 
-        time.sleep(1)  # Optional delay between orders to avoid rate limit issues
-
-def fetch_tradable_symbols():
-    """Fetch trading pairs and format them into tradable symbol names."""
-    url = 'https://openapi.gaiaex.com/sapi/v1/symbols'  # URL to fetch pairs list
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        symbols = data.get('symbols', [])
-        tradable_symbols = [
-            f"{symbol['baseAsset']}/{symbol['quoteAsset']}"  # Convert to 'Base/Quote' format
-            for symbol in symbols
-            if symbol['quoteAsset'].upper() == 'USDT'  # Filter for USDT pairs only (if needed)
-        ]
-        return tradable_symbols
-    else:
-        print("Failed to fetch pairs list:", response.text)
-        return []
-
-def get_assets_dict(api_key, secret_key):
+def get_assets_dict(api_key, secret_key, catalog):
     """Generate a dictionary of assets with symbolName, volume, and quantityPrecision."""
     account_info = fetch_account_info(api_key, secret_key)
     if not account_info:
         print("Failed to fetch account information.")
         return {}
 
-    precision_data, _ = fetch_pairs_precision()
+    precision_data = catalog.precision_data
 
     # Account balances
     account_dict = {balance['asset']: float(balance['free']) for balance in account_info.get('balances', [])}
@@ -185,26 +183,22 @@ def get_assets_dict(api_key, secret_key):
             base_asset = asset[:-4]
             symbol_name = f"{base_asset}/USDT"
             # Retrieve quantity precision from precision data
-            precision = precision_data.get(f"{base_asset.lower()}usdt1802", {}).get('quantityPrecision', 8)
+            precision = precision_data.get(f"{base_asset.lower()}usdt1802", (None, 8))[1]
             # Add to dictionary
             assets_dict[symbol_name] = {'volume': balance, 'quantityPrecision': precision}
 
     return assets_dict
 
-def truncate(value, precision):
-    """Truncate a number to a specific number of decimal places."""
-    factor = 10 ** precision
-    return int(value * factor) / factor
-
 def sell_asset(api_key, secret_key, symbol_name, volume, quantity_precision):
     """Place a market sell order for a specific asset."""
     url = f"{BASE_URL}{REQUEST_PATH}"
-    timestamp = int(time.time() * 1000)
+    ORDER_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
+    timestamp = time.time_ns() // 1_000_000
 
     # Truncate the volume to match the quantity precision
     volume = truncate(volume, quantity_precision)
 
-    params = json.dumps({
+    params = orjson.dumps({
         'symbolName': symbol_name,  # Asset in Base/Quote format
         'volume': volume,           # Truncated volume
         'side': 'SELL',             # Side of the order
@@ -213,13 +207,13 @@ def sell_asset(api_key, secret_key, symbol_name, volume, quantity_precision):
         'recvWindow': 5000
     })
 
-    headers = create_headers(api_key, secret_key, timestamp, params)
+    headers = signed_post(api_key, secret_key, REQUEST_PATH, params, timestamp)
 
     try:
         print(f"Placing SELL order for {symbol_name}: {volume}")
-        response = requests.post(url, headers=headers, data=params)
+        response = SESSION.post(url, headers=headers, data=params)
         if response.status_code == 200:
-            print(f"Order placed successfully: {response.json()}")
+            print(f"Order placed successfully: {orjson.loads(response.content)}")
         else:
             print(f"Failed to place order. Status Code: {response.status_code}, Response: {response.text}")
     except requests.RequestException as e:
@@ -230,12 +224,15 @@ if __name__ == '__main__':
     api_key = config['GAIAEX_API_KEY']
     secret_key = config['GAIAEX_SECRET_KEY']
 
+    # Symbol metadata is loaded once and shared by the snapshot and the assets dictionary
+    catalog = SymbolCatalog.load()
+
     # Print initial asset list
     print("Initial Asset List:")
-    balance_snapshot(api_key, secret_key)
+    balance_snapshot(api_key, secret_key, catalog)
     
     # Generate and display assets dictionary
-    assets_dict = get_assets_dict(api_key, secret_key)
+    assets_dict = get_assets_dict(api_key, secret_key, catalog)
     print("Assets Dictionary:")
     print(json.dumps(assets_dict, indent=4))
 
@@ -1,10 +1,13 @@
 import requests
 import json
-import hashlib
-import hmac
+import orjson
 import time
 from prettytable import PrettyTable
 import random
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from gaiaex_client import TokenBucket, create_session, signed_headers, signed_post
+from gaiaex_meta import SymbolCatalog, truncate
 
 
 RANDOM_TRADE_COUNT = 20
@@ -13,7 +16,6 @@ CONFIG_FILE = 'UID32937591.json'
 BASE_URL = 'https://openapi.gaiaex.com'  # Base URL for Spot API
 ACCOUNT_PATH = '/sapi/v1/account'
 DEPTH_PATH = '/sapi/v1/depth'
-SYMBOLS_PATH = '/sapi/v1/symbols'
 REQUEST_PATH = '/sapi/v1/order'  # Request path for placing a new spot order
 SYMBOL_NAME = 'btc/USDT'  # Updated symbol name for the currency pair
 TOTAL_VOLUME = 1.37  # Total amount to buy/sell
@@ -21,6 +23,11 @@ SIDE = 'SELL'  # BUY or SELL
 ORDER_TYPE = 'MARKET'  # Order type
 ORDER_COUNT = 5  # Number of market orders to be placed
 THRESHOLD = 1  # Minimum balance threshold
+MAX_WORKERS = 16  # Best-bid requests in flight at once
+
+SESSION = create_session()
+
+ORDER_BUCKET = TokenBucket.for_orders()
 
 
 def load_config(config_file):
@@ -28,89 +35,71 @@ def load_config(config_file):
     with open(config_file, 'r') as file:
         return json.load(file)
 
-def generate_signature(secret_key, payload):
-    """Generate HMAC signature for GET requests."""
-    return hmac.new(secret_key.encode(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
-
-def generate_signature_post(secret_key, timestamp, body):
-    """Generate HMAC signature for POST requests."""
-    signature_payload = f"{timestamp}POST{REQUEST_PATH}{body}".encode('utf-8')
-    return hmac.new(secret_key.encode(), signature_payload, hashlib.sha256).hexdigest()
-
-def create_headers(api_key, secret_key, timestamp, body):
-    """Create headers for the API request."""
-    signature = generate_signature_post(secret_key, timestamp, body)
-    return {
-        'X-CH-APIKEY': api_key,
-        'X-CH-SIGN': signature,
-        'X-CH-TS': str(timestamp),
-        'Content-Type': 'application/json'
-    }
-
 def fetch_account_info(api_key, secret_key):
     """Fetch account balances."""
-    timestamp = int(time.time() * 1000)
-    signature_payload = f"{timestamp}GET{ACCOUNT_PATH}"
-    signature = generate_signature(secret_key, signature_payload)
-    headers = {'X-CH-APIKEY': api_key, 'X-CH-SIGN': signature, 'X-CH-TS': str(timestamp)}
-    response = requests.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
-    return response.json() if response.status_code == 200 else None
-
-def fetch_pairs_precision():
-    """Fetch precision and mappings for trading pairs."""
-    response = requests.get(f"{BASE_URL}{SYMBOLS_PATH}")
-    if response.status_code != 200:
-        return {}, {}
-    data = response.json().get('symbols', [])
-    precision_data = {s['symbol'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    asset_to_symbol_map = {s['baseAsset'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    return precision_data, asset_to_symbol_map
+    headers = signed_headers(api_key, secret_key, 'GET', ACCOUNT_PATH)
+    response = SESSION.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
+    return orjson.loads(response.content) if response.status_code == 200 else None
 
 def fetch_best_bid(asset):
     """Fetch the best bid price for an asset."""
-    response = requests.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
-    bids = response.json().get('bids', []) if response.status_code == 200 else []
+    response = SESSION.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
+    bids = orjson.loads(response.content).get('bids', []) if response.status_code == 200 else []
     return float(bids[0][0]) if bids else None
 
-def balance_snapshot(api_key, secret_key):
+def balance_snapshot(api_key, secret_key, catalog):
     account_info = fetch_account_info(api_key, secret_key)
     if not account_info:
         print("Failed to fetch account information.")
         exit(1)
 
-    precision_data, asset_to_symbol_map = fetch_pairs_precision()
+    precision_data, asset_to_symbol_map = catalog.precision_data, catalog.asset_to_symbol_map
 
     account_dict = {balance['asset']: float(balance['free']) for balance in account_info.get('balances', [])}
 
+    # Symbol and base-asset keys are derived once per asset and shared by the bid and precision lookups
+    keymap = {asset: (f"{asset.lower()}usdt1802", asset[:-4], asset[:-4].lower()) for asset in account_dict}
+
+    # Every depth lookup is submitted up front so the round-trips overlap instead of running back to back.
+    # Empty balances are worth nothing at any price, so they never cost a request
+    assets = [asset for asset, balance in account_dict.items() if balance > 0 and asset != "USDT1802"]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        bids = dict(zip(assets, executor.map(fetch_best_bid, assets)))
+
+    bids["USDT1802"] = 1.0  # The quote asset is priced at par
+
+    # Value, filter and sort every asset in one vectorized pass; unpriced assets stay NaN and drop out.
+    # These are single NumPy ufunc calls already, so a numba kernel would only add a JIT compile and a dependency
+    names = list(account_dict)
+    balances = np.fromiter(account_dict.values(), dtype=np.float64, count=len(names))
+    bid_prices = np.fromiter((bids.get(asset) or np.nan for asset in names), dtype=np.float64, count=len(names))
+    values = balances * bid_prices
+    order = np.argsort(-values, kind='stable')
+    order = order[values[order] > 0.1]  # Only include rows where the value is greater than 0.1 USDT
+
     rows = []
     result_dict = {}  # Initialize an empty dictionary to store the result
-    for asset, balance in account_dict.items():
-        symbol = f"{asset.lower()}usdt1802"
-        base_asset = asset[:-4]
-        bid_price = 1.0 if asset == "USDT1802" else fetch_best_bid(asset)
-        value = balance * bid_price if bid_price else 0
+    for i, balance, bid_price, value in zip(order.tolist(), balances[order].tolist(), bid_prices[order].tolist(), values[order].tolist()):
+        asset = names[i]
+        symbol, base_asset, base_key = keymap[asset]
 
-        precision = precision_data.get(symbol, asset_to_symbol_map.get(base_asset.lower(), {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}))
+        price_precision, quantity_precision = precision_data.get(symbol, asset_to_symbol_map.get(base_key, ('N/A', 'N/A')))
 
         meets_threshold = "Yes" if balance > THRESHOLD and asset.endswith("1802") else "No"
 
-        # Only include rows where the value is greater than 0.1 USDT
-        if value > 0.1:
-            rows.append([asset, symbol, base_asset, balance, bid_price, value, precision['pricePrecision'], precision['quantityPrecision'], meets_threshold])
-            # Add entry to result_dict using Base Asset as the key
-            result_dict[base_asset] = {
-                "Asset": asset,
-                "Symbol": symbol,
-                "Free Balance": balance,
-                "Bid Price": bid_price,
-                "Value (USDT)": value,
-                "Price Precision": precision['pricePrecision'],
-                "Quantity Precision": precision['quantityPrecision'],
-                "Meets Threshold": meets_threshold,
-            }
+        rows.append([asset, symbol, base_asset, balance, bid_price, value, price_precision, quantity_precision, meets_threshold])
+        # Add entry to result_dict using Base Asset as the key
+        result_dict[base_asset] = {
+            "Asset": asset,
+            "Symbol": symbol,
+            "Free Balance": balance,
+            "Bid Price": bid_price,
+            "Value (USDT)": value,
+            "Price Precision": price_precision,
+            "Quantity Precision": quantity_precision,
+            "Meets Threshold": meets_threshold,
+        }
 
-    # Sort rows by Value (USDT) in descending order
-    rows.sort(key=lambda x: x[5], reverse=True)
     # Create PrettyTable
     table = PrettyTable()
     table.field_names = ["Asset", "Symbol", "Base Asset", "Free Balance", "Bid Price", "Value (USDT)", 
@@ -135,6 +124,7 @@ def place_market_orders(api_key, secret_key, symbol_name, total_volume, side, or
 
     for i in range(order_count):
         print(f"Placing order {i + 1} of {order_count}")
+        ORDER_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
         timestamp = int(time.time() * 1000)
 
         params = {
@@ -145,74 +135,55 @@ def place_market_orders(api_key, secret_key, symbol_name, total_volume, side, or
             'timestamp': timestamp,
             'recvWindow': 5000
         }
-        body = json.dumps(params)
-        headers = create_headers(api_key, secret_key, timestamp, body)
+        body = orjson.dumps(params)  # Signed and sent as the same bytes
+        headers = signed_post(api_key, secret_key, REQUEST_PATH, body, timestamp)
 
         try:
             print(f"Request Headers: {headers}")
-            print(f"Request Body: {body}")  # Log request body for debugging
-            response = requests.post(full_url, headers=headers, data=body)
+            print(f"Request Body: {body.decode()}")  # Log request body for debugging
+            response = SESSION.post(full_url, headers=headers, data=body)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"Order {i + 1} placed successfully: {data}")
             else:
                 print(f"Failed to place order {i + 1}. Status Code: {response.status_code}, Response: {response.text}")
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             print(f"An error occurred while placing order {i + 1}: {e}")
 
-        time.sleep(1)  # Optional delay between orders to avoid rate limit issues
-
-def fetch_tradable_symbols():
-    """Fetch trading pairs and format them into tradable symbol names."""
-    url = 'https://openapi.gaiaex.com/sapi/v1/symbols'  # URL to fetch pairs list
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        symbols = data.get('symbols', [])
-        tradable_symbols = [
-            f"{symbol['baseAsset']}/{symbol['quoteAsset']}"  # Convert to 'Base/Quote' format
-            for symbol in symbols
-            if symbol['quoteAsset'].upper() == 'USDT'  # Filter for USDT pairs only (if needed)
-        ]
-        return tradable_symbols
-    else:
-        print("Failed to fetch pairs list:", response.text)
-        return []
-
-def create_asset_summary(api_key, secret_key):
+def create_asset_summary(api_key, secret_key, catalog):
     """Create a dictionary summarizing key details for each Base Asset."""
     account_info = fetch_account_info(api_key, secret_key)
     if not account_info:
         print("Failed to fetch account information.")
         exit(1)
 
-    # Fetch tradable symbols dynamically (now based on the actual available pairs)
-    tradable_symbols = fetch_tradable_symbols()
-
-    # Fetch precision data and map from symbol to base/quote pairs
-    precision_data, asset_to_symbol_map = fetch_pairs_precision()
+    # Precision maps and the base-asset index come from the catalog built once in __main__
+    precision_data, asset_to_symbol_map = catalog.precision_data, catalog.asset_to_symbol_map
 
     account_dict = {balance['asset']: float(balance['free']) for balance in account_info.get('balances', [])}
 
-    asset_summary = {}  # Dictionary to hold the summary for each Base Asset
+    # Each asset is an exact lookup by lowercase base asset
+    # (a substring scan also matched e.g. BTC against XBTC/USDT)
+    symbol_by_base = catalog.symbol_by_base
+
+    matched = []
     for asset, balance in account_dict.items():
         # Dynamically find the correct symbol for the asset (Base/Quote format)
-        symbol = None
-        for tradable_symbol in tradable_symbols:
-            if asset.lower() in tradable_symbol.lower():
-                symbol = tradable_symbol
-                break
-        
+        symbol = symbol_by_base.get(asset.lower())
         if not symbol:
             continue  # If no matching symbol is found, skip this asset
+        matched.append((asset, balance, symbol))
+
+    # Now that we have the correct symbols, we fetch every best bid price concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        bid_prices = list(executor.map(fetch_best_bid, [symbol for _, _, symbol in matched]))
 
-        # Now that we have the correct symbol, we fetch the best bid price
-        bid_price = fetch_best_bid(symbol)
+    asset_summary = {}  # Dictionary to hold the summary for each Base Asset
+    for (asset, balance, symbol), bid_price in zip(matched, bid_prices):
         value = balance * bid_price if bid_price else 0
 
         # Adjust precision based on the dynamically fetched symbol
-        precision = precision_data.get(symbol.lower(), asset_to_symbol_map.get(asset.lower(), {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}))
+        price_precision, quantity_precision = precision_data.get(symbol.lower(), asset_to_symbol_map.get(asset.lower(), ('N/A', 'N/A')))
 
         # Only include assets with a non-zero value
         if value > 0:
@@ -220,24 +191,12 @@ def create_asset_summary(api_key, secret_key):
             asset_summary[base_asset] = {
                 "USDT Value": value,
                 "Free Balance": balance,
-                "Quantity Precision": precision.get('quantityPrecision', 'N/A'),
-                "Price Precision": precision.get('pricePrecision', 'N/A')
+                "Quantity Precision": quantity_precision,
+                "Price Precision": price_precision
             }
 
     return asset_summary
 
-def truncate(volume, precision):
-    # Ensure precision is an integer
-    try:
-        precision = int(precision)
-    except ValueError:
-        # Handle invalid precision (e.g., "N/A")
-        print(f"Invalid precision: {precision}. Skipping truncation.")
-        return volume
-
-    factor = 10 ** precision
-    return int(volume * factor) / factor
-
 def sell_asset(api_key, secret_key, symbol_name, volume, quantity_precision):
     """Place a market sell order for a specific asset."""
     url = f"{BASE_URL}{REQUEST_PATH}"
@@ -246,7 +205,7 @@ def sell_asset(api_key, secret_key, symbol_name, volume, quantity_precision):
     # Truncate the volume to match the quantity precision
     volume = truncate(volume, quantity_precision)
 
-    params = json.dumps({
+    params = orjson.dumps({
         'symbolName': symbol_name,  # Asset in Base/Quote format
         'volume': volume,           # Truncated volume
         'side': 'SELL',             # Side of the order
@@ -255,16 +214,16 @@ def sell_asset(api_key, secret_key, symbol_name, volume, quantity_precision):
         'recvWindow': 5000
     })
 
-    headers = create_headers(api_key, secret_key, timestamp, params)
+    headers = signed_post(api_key, secret_key, REQUEST_PATH, params, timestamp)
 
     try:
         print(f"Placing SELL order for {symbol_name}: {volume}")
-        response = requests.post(url, headers=headers, data=params)
+        response = SESSION.post(url, headers=headers, data=params)
         if response.status_code == 200:
-            print(f"Order placed successfully: {response.json()}")
+            print(f"Order placed successfully: {orjson.loads(response.content)}")
         else:
             print(f"Failed to place order. Status Code: {response.status_code}, Response: {response.text}")
-    except requests.RequestException as e:
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"An error occurred while placing the order: {e}")
 
 def sell_all_assets(api_key, secret_key, asset_summary):
@@ -293,11 +252,12 @@ if __name__ == '__main__':
     api_key = config['GAIAEX_API_KEY']
     secret_key = config['GAIAEX_SECRET_KEY']
     
-    symbolsname = fetch_tradable_symbols()
-    print(symbolsname)
+    # Symbol metadata is loaded once and shared by every step below
+    catalog = SymbolCatalog.load()
+    print(catalog.tradable_symbols)
 
     # Fetch the asset summary
-    asset_summary = create_asset_summary(api_key, secret_key)
+    asset_summary = create_asset_summary(api_key, secret_key, catalog)
     print("Asset Summary:")
     print(json.dumps(asset_summary, indent=4))
 
@@ -1,9 +1,11 @@
 import requests
 import json
+import orjson
 import hashlib
 import hmac
 import time
 from prettytable import PrettyTable
+from gaiaex_client import TokenBucket
 import random
 
 
@@ -22,6 +24,8 @@ ORDER_TYPE = 'MARKET'  # Order type
 ORDER_COUNT = 5  # Number of market orders to be placed
 THRESHOLD = 1  # Minimum balance threshold
 
+ORDER_BUCKET = TokenBucket.for_orders()
+
 def load_config(config_file):
     """Load API configuration from a JSON file."""
     with open(config_file, 'r') as file:
@@ -53,22 +57,24 @@ def fetch_account_info(api_key, secret_key):
     signature = generate_signature(secret_key, signature_payload)
     headers = {'X-CH-APIKEY': api_key, 'X-CH-SIGN': signature, 'X-CH-TS': str(timestamp)}
     response = requests.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
-    return response.json() if response.status_code == 200 else None
+    return orjson.loads(response.content) if response.status_code == 200 else None
 
 def fetch_pairs_precision():
     """Fetch precision and mappings for trading pairs."""
     response = requests.get(f"{BASE_URL}{SYMBOLS_PATH}")
     if response.status_code != 200:
         return {}, {}
-    data = response.json().get('symbols', [])
-    precision_data = {s['symbol'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
-    asset_to_symbol_map = {s['baseAsset'].lower(): {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']} for s in data}
+    data = orjson.loads(response.content).get('symbols', [])
+    # One pass fills both maps, sharing a single precision dict per symbol
+    precision_data, asset_to_symbol_map = {}, {}
+    for s in data:
+        precision_data[s['symbol'].lower()] = asset_to_symbol_map[s['baseAsset'].lower()] = {'pricePrecision': s['pricePrecision'], 'quantityPrecision': s['quantityPrecision']}
     return precision_data, asset_to_symbol_map
 
 def fetch_best_bid(asset):
     """Fetch the best bid price for an asset."""
     response = requests.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
-    bids = response.json().get('bids', []) if response.status_code == 200 else []
+    bids = orjson.loads(response.content).get('bids', []) if response.status_code == 200 else []
     return float(bids[0][0]) if bids else None
 
 def balance_snapshot(api_key, secret_key):
@@ -120,6 +126,7 @@ def place_market_orders(api_key, secret_key, symbol_name, total_volume, side, or
 
     for i in range(order_count):
         print(f"Placing order {i + 1} of {order_count}")
+        ORDER_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
         timestamp = int(time.time() * 1000)
 
         params = {
@@ -138,22 +145,20 @@ def place_market_orders(api_key, secret_key, symbol_name, total_volume, side, or
             print(f"Request Body: {body}")  # Log request body for debugging
             response = requests.post(full_url, headers=headers, data=body)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"Order {i + 1} placed successfully: {data}")
             else:
                 print(f"Failed to place order {i + 1}. Status Code: {response.status_code}, Response: {response.text}")
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             print(f"An error occurred while placing order {i + 1}: {e}")
 
-        time.sleep(1)  # Optional delay between orders to avoid rate limit issues
-
 def fetch_tradable_symbols():
     """Fetch trading pairs and format them into tradable symbol names."""
     url = 'https://openapi.gaiaex.com/sapi/v1/symbols'  # URL to fetch pairs list
     response = requests.get(url)
     
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         symbols = data.get('symbols', [])
         tradable_symbols = [
             f"{symbol['baseAsset']}/{symbol['quoteAsset']}"  # Convert to 'Base/Quote' format
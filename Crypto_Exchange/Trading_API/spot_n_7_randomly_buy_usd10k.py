@@ -1,10 +1,12 @@
-import requests
+import asyncio
+import httpx
 import json
-import hashlib
-import hmac
+import orjson
 import time
 import random
 from prettytable import PrettyTable
+from gaiaex_client import ACCOUNT_PATH, TokenBucket, create_session, order_body_template, signed_headers, signed_post
+from gaiaex_meta import fetch_tradable_symbols
 
 # Constants
 CONFIG_FILE = 'UID32937591.json'
@@ -13,65 +15,54 @@ REQUEST_PATH = '/sapi/v1/order'
 RANDOM_TRADE_COUNT = 500
 TOTAL_VOLUME = 1000  # Total amount to buy/sell
 ORDER_COUNT = 1  # Number of market orders to be placed
+MAX_CONCURRENCY = 20  # Random trades in flight at once
+MAX_CONNECTIONS = 20  # HTTP/2 connections the order client may open
+
+SESSION = create_session()
+
+# Shared by every order task so concurrent trades stay within the exchange rate limit
+ORDER_BUCKET = TokenBucket.for_orders()
 
 def load_config(file):
     with open(file, 'r') as f:
         return json.load(f)
 
-def generate_signature(secret_key, payload):
-    return hmac.new(secret_key.encode(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
-
-def create_headers(api_key, secret_key, timestamp, body):
-    signature = generate_signature(secret_key, f"{timestamp}POST{REQUEST_PATH}{body}")
-    return {
-        'X-CH-APIKEY': api_key,
-        'X-CH-SIGN': signature,
-        'X-CH-TS': str(timestamp),
-        'Content-Type': 'application/json'
-    }
-
 def fetch_account_info(api_key, secret_key):
-    timestamp = int(time.time() * 1000)
-    payload = f"{timestamp}GET/sapi/v1/account"
-    headers = create_headers(api_key, secret_key, timestamp, "")
-    response = requests.get(f"{BASE_URL}/sapi/v1/account", headers=headers)
-    return response.json() if response.status_code == 200 else {}
-
-def fetch_tradable_symbols():
-    response = requests.get(f"{BASE_URL}/sapi/v1/symbols")
-    if response.status_code != 200:
-        print("Failed to fetch pairs list:", response.text)
-        return []
-    return [
-        f"{s['baseAsset']}/{s['quoteAsset']}" for s in response.json().get('symbols', [])
-        if s['quoteAsset'].upper() == 'USDT'
-    ]
+    headers = signed_headers(api_key, secret_key, 'GET', ACCOUNT_PATH)
+    response = SESSION.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
+    return orjson.loads(response.content) if response.status_code == 200 else {}
 
-def place_market_orders(api_key, secret_key, symbol_name):
+async def place_market_orders(client, api_key, secret_key, symbol_name):
     per_order_volume = TOTAL_VOLUME / ORDER_COUNT
-    url = f"{BASE_URL}{REQUEST_PATH}"
+    head, tail = order_body_template(symbol_name, per_order_volume)
 
     for i in range(ORDER_COUNT):
+        await ORDER_BUCKET.acquire_async()  # Before the timestamp, so time spent waiting does not eat into recvWindow
         timestamp = int(time.time() * 1000)
-        params = json.dumps({
-            'symbolName': symbol_name,
-            'volume': per_order_volume,
-            'side': 'BUY',
-            'type': 'MARKET',
-            'timestamp': timestamp,
-            'recvWindow': 5000
-        })
-        headers = create_headers(api_key, secret_key, timestamp, params)
+        params = b"%s%d%s" % (head, timestamp, tail)  # Compact bytes body: signed and sent as-is
+        headers = signed_post(api_key, secret_key, REQUEST_PATH, params, timestamp)
 
         try:
-            response = requests.post(url, headers=headers, data=params)
+            response = await client.post(REQUEST_PATH, headers=headers, content=params)
             if response.status_code == 200:
-                print(f"Order {i + 1} placed successfully: {response.json()}")
+                print(f"Order {i + 1} placed successfully: {orjson.loads(response.content)}")
             else:
                 print(f"Failed to place order {i + 1}: {response.text}")
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:  # ValueError covers a 200 reply whose body is not JSON
             print(f"Error placing order {i + 1}: {e}")
-        time.sleep(1)  # To avoid rate limits
+
+async def run_random_trades(api_key, secret_key, tradable_list):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+
+    async def bounded_trade(client, symbol_name):
+        async with semaphore:
+            print(f"\nRandomly selected symbol for trade: {symbol_name}")
+            await place_market_orders(client, api_key, secret_key, symbol_name)
+
+    # One HTTP/2 client multiplexes every order; ORDER_BUCKET keeps the overall rate within the exchange limit
+    async with httpx.AsyncClient(http2=True, base_url=BASE_URL, limits=limits) as client:
+        await asyncio.gather(*(bounded_trade(client, random.choice(tradable_list)) for _ in range(RANDOM_TRADE_COUNT)))
 
 if __name__ == '__main__':
     config = load_config(CONFIG_FILE)
@@ -85,8 +76,4 @@ if __name__ == '__main__':
         exit()
 
     # Execute random trades
-    for _ in range(RANDOM_TRADE_COUNT):
-        symbol_name = random.choice(tradable_list)
-        print(f"\nRandomly selected symbol for trade: {symbol_name}")
-        place_market_orders(api_key, secret_key, symbol_name)
-
+    asyncio.run(run_random_trades(api_key, secret_key, tradable_list))
@@ -1,12 +1,14 @@
+import asyncio
+import httpx
 import requests
 import json
-import hashlib
-import hmac
+import orjson
 import time
 import random
 import logging
 from logging.handlers import RotatingFileHandler
-from prettytable import PrettyTable  # Ensure PrettyTable is imported
+from gaiaex_client import ACCOUNT_PATH, TokenBucket, create_session, order_body_template, signed_headers, signed_post
+from gaiaex_meta import fetch_symbols
 
 # Constants
 CONFIG_FILE = 'UID32937591.json'
@@ -15,6 +17,13 @@ REQUEST_PATH = '/sapi/v1/order'
 RANDOM_TRADE_COUNT = 1000
 TOTAL_VOLUME = 856  # Total amount to buy/sell
 ORDER_COUNT = 1  # Number of market orders to be placed
+MAX_CONCURRENCY = 20  # Random trades in flight at once
+MAX_CONNECTIONS = 20  # HTTP/2 connections the order client may open
+
+SESSION = create_session()
+
+# Shared by every order task so concurrent trades stay within the exchange rate limit
+ORDER_BUCKET = TokenBucket.for_orders()
 
 def load_config(file):
     try:
@@ -23,103 +32,101 @@ def load_config(file):
         logging.info("Configuration loaded successfully.")
         return config
     except FileNotFoundError:
-        logging.error(f"Configuration file {file} not found.")
+        logging.error("Configuration file %s not found.", file)
         exit()
     except json.JSONDecodeError:
-        logging.error(f"Error decoding JSON from the configuration file {file}.")
+        logging.error("Error decoding JSON from the configuration file %s.", file)
         exit()
 
-def generate_signature(secret_key, payload):
-    signature = hmac.new(secret_key.encode(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
-    logging.debug(f"Generated signature: {signature}")
-    return signature
-
-def create_headers(api_key, secret_key, timestamp, body):
-    signature = generate_signature(secret_key, f"{timestamp}POST{REQUEST_PATH}{body}")
-    headers = {
-        'X-CH-APIKEY': api_key,
-        'X-CH-SIGN': signature,
-        'X-CH-TS': str(timestamp),
-        'Content-Type': 'application/json'
-    }
-    logging.debug(f"Headers created: {headers}")
-    return headers
-
 def fetch_account_info(api_key, secret_key):
-    timestamp = int(time.time() * 1000)
-    payload = f"{timestamp}GET/sapi/v1/account"
-    headers = create_headers(api_key, secret_key, timestamp, "")
+    headers = signed_headers(api_key, secret_key, 'GET', ACCOUNT_PATH)
     try:
-        response = requests.get(f"{BASE_URL}/sapi/v1/account", headers=headers)
+        response = SESSION.get(f"{BASE_URL}{ACCOUNT_PATH}", headers=headers)
         if response.status_code == 200:
             logging.info("Account information fetched successfully.")
-            return response.json()
+            return orjson.loads(response.content)
         else:
-            logging.error(f"Failed to fetch account info: {response.status_code} - {response.text}")
+            logging.error("Failed to fetch account info: %s - %s", response.status_code, response.text)
             return {}
     except requests.RequestException as e:
-        logging.error(f"Request exception while fetching account info: {e}")
+        logging.error("Request exception while fetching account info: %s", e)
         return {}
 
+def format_symbol_table(symbols):
+    # Fixed-width "No. | Symbol" listing rendered in one pass; column widths come from a single max() over the names
+    number_width = max(len("No."), len(str(len(symbols))))
+    symbol_width = max([len("Symbol")] + [len(symbol) for symbol in symbols])
+    border = f"+-{'-' * number_width}-+-{'-' * symbol_width}-+"
+    lines = [border, f"| {'No.':>{number_width}} | {'Symbol':<{symbol_width}} |", border]
+    lines.extend(f"| {idx:>{number_width}} | {symbol:<{symbol_width}} |" for idx, symbol in enumerate(symbols, start=1))
+    lines.append(border)
+    return "\n".join(lines)
+
 def fetch_tradable_symbols():
     try:
-        response = requests.get(f"{BASE_URL}/sapi/v1/symbols")
-        if response.status_code != 200:
-            logging.error(f"Failed to fetch pairs list: {response.status_code} - {response.text}")
+        # Served from the in-process / on-disk symbols cache when a recent copy exists
+        symbols_data = fetch_symbols()
+        if symbols_data is None:
+            logging.error("Failed to fetch pairs list.")
             return []
-        symbols_data = response.json().get('symbols', [])
         symbols = [
             f"{s['baseAsset']}/{s['quoteAsset']}" for s in symbols_data
             if s['quoteAsset'].upper() == 'USDT' and s['baseAsset'].upper() != 'USDT'
         ]
-        logging.info(f"Fetched {len(symbols)} tradable symbols.")
+        logging.info("Fetched %d tradable symbols.", len(symbols))
 
-        # Create the table
-        table = PrettyTable()
-        table.field_names = ["No.", "Symbol"]
-        for idx, symbol in enumerate(symbols, start=1):
-            table.add_row([idx, symbol])
-        
-        # Convert table to string
-        table_str = table.get_string()
+        # Render the table once; the same string is logged and printed
+        table_str = format_symbol_table(symbols)
 
         # Log the table
-        logging.info("Available Tradable Symbols:\n" + table_str)
+        logging.info("Available Tradable Symbols:\n%s", table_str)
 
         # Optional: Print the table to the console
         print("\nAvailable Tradable Symbols:")
-        print(table)
+        print(table_str)
 
         return symbols
     except requests.RequestException as e:
-        logging.error(f"Request exception while fetching tradable symbols: {e}")
+        logging.error("Request exception while fetching tradable symbols: %s", e)
         return []
 
-def place_market_orders(api_key, secret_key, symbol_name):
+async def place_market_orders(client, api_key, secret_key, symbol_name):
     per_order_volume = TOTAL_VOLUME / ORDER_COUNT
-    url = f"{BASE_URL}{REQUEST_PATH}"
+    head, tail = order_body_template(symbol_name, per_order_volume)
 
     for i in range(ORDER_COUNT):
+        await ORDER_BUCKET.acquire_async()  # Before the timestamp, so time spent waiting does not eat into recvWindow
         timestamp = int(time.time() * 1000)
-        params = json.dumps({
-            'symbolName': symbol_name,
-            'volume': per_order_volume,
-            'side': 'BUY',
-            'type': 'MARKET',
-            'timestamp': timestamp,
-            'recvWindow': 5000
-        })
-        headers = create_headers(api_key, secret_key, timestamp, params)
+        params = b"%s%d%s" % (head, timestamp, tail)  # Compact bytes body: signed and sent as-is
+        headers = signed_post(api_key, secret_key, REQUEST_PATH, params, timestamp)
+        logging.debug("Headers created: %r", headers)
 
         try:
-            response = requests.post(url, headers=headers, data=params)
+            response = await client.post(REQUEST_PATH, headers=headers, content=params)
             if response.status_code == 200:
-                logging.info(f"Order {i + 1} placed successfully for {symbol_name}: {response.json()}")
+                logging.info("Order %d placed successfully for %s: %s", i + 1, symbol_name, orjson.loads(response.content))
             else:
-                logging.error(f"Failed to place order {i + 1} for {symbol_name}: {response.status_code} - {response.text}")
-        except requests.RequestException as e:
-            logging.error(f"Error placing order {i + 1} for {symbol_name}: {e}")
-        time.sleep(1)  # To avoid rate limits
+                logging.error("Failed to place order %d for %s: %s - %s", i + 1, symbol_name, response.status_code, response.text)
+        except (httpx.HTTPError, ValueError) as e:  # ValueError covers a 200 reply whose body is not JSON
+            logging.error("Error placing order %d for %s: %s", i + 1, symbol_name, e)
+
+async def run_random_trades(api_key, secret_key, tradable_list):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+
+    async def bounded_trade(client, trade_number, symbol_name):
+        async with semaphore:
+            logging.info("Trade %d: Randomly selected symbol for trade: %s", trade_number, symbol_name)
+            await place_market_orders(client, api_key, secret_key, symbol_name)
+
+    # One HTTP/2 client multiplexes every order; ORDER_BUCKET keeps the overall rate within the exchange limit.
+    # Orders stay one POST each: the spot API used here documents no batch-order endpoint, and each random trade
+    # targets a different symbol, so pipelining over the shared connection is the batching available
+    async with httpx.AsyncClient(http2=True, base_url=BASE_URL, limits=limits) as client:
+        await asyncio.gather(*(
+            bounded_trade(client, trade_number, random.choice(tradable_list))
+            for trade_number in range(1, RANDOM_TRADE_COUNT + 1)
+        ))
 
 if __name__ == '__main__':
     # Configure Logging with RotatingFileHandler
@@ -150,9 +157,6 @@ if __name__ == '__main__':
         exit()
 
     # Execute random trades
-    for trade_number in range(1, RANDOM_TRADE_COUNT + 1):
-        symbol_name = random.choice(tradable_list)
-        logging.info(f"Trade {trade_number}: Randomly selected symbol for trade: {symbol_name}")
-        place_market_orders(api_key, secret_key, symbol_name)
+    asyncio.run(run_random_trades(api_key, secret_key, tradable_list))
 
     logging.info("Program completed.")
@@ -1,11 +1,13 @@
 import requests
 import json
+import orjson
 import hashlib
 import hmac
 import time
 import logging
 from logging.handlers import RotatingFileHandler
 from prettytable import PrettyTable  # Ensure PrettyTable is imported
+from gaiaex_client import TokenBucket
 
 # Constants
 CONFIG_FILE = 'UID32937591.json'
@@ -14,6 +16,8 @@ REQUEST_PATH = '/sapi/v1/order'
 TOTAL_VOLUME = 10000  # Total amount to buy/sell
 ORDER_COUNT = 1  # Number of market orders to be placed
 
+ORDER_BUCKET = TokenBucket.for_orders()
+
 def load_config(file):
     try:
         with open(file, 'r') as f:
@@ -52,11 +56,11 @@ def fetch_account_info(api_key, secret_key):
         response = requests.get(f"{BASE_URL}/sapi/v1/account", headers=headers)
         if response.status_code == 200:
             logging.info("Account information fetched successfully.")
-            return response.json()
+            return orjson.loads(response.content)
         else:
             logging.error(f"Failed to fetch account info: {response.status_code} - {response.text}")
             return {}
-    except requests.RequestException as e:
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         logging.error(f"Request exception while fetching account info: {e}")
         return {}
 
@@ -66,7 +70,7 @@ def fetch_tradable_symbols():
         if response.status_code != 200:
             logging.error(f"Failed to fetch pairs list: {response.status_code} - {response.text}")
             return []
-        symbols_data = response.json().get('symbols', [])
+        symbols_data = orjson.loads(response.content).get('symbols', [])
         symbols = [
             f"{s['baseAsset']}/{s['quoteAsset']}" for s in symbols_data
             if s['quoteAsset'].upper() == 'USDT' and s['baseAsset'].upper() != 'USDT'
@@ -90,7 +94,7 @@ def fetch_tradable_symbols():
         print(table)
 
         return symbols
-    except requests.RequestException as e:
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         logging.error(f"Request exception while fetching tradable symbols: {e}")
         return []
 
@@ -99,6 +103,7 @@ def place_market_orders(api_key, secret_key, symbol_name):
     url = f"{BASE_URL}{REQUEST_PATH}"
 
     for i in range(ORDER_COUNT):
+        ORDER_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
         timestamp = int(time.time() * 1000)
         params = json.dumps({
             'symbolName': symbol_name,
@@ -113,12 +118,11 @@ def place_market_orders(api_key, secret_key, symbol_name):
         try:
             response = requests.post(url, headers=headers, data=params)
             if response.status_code == 200:
-                logging.info(f"Order {i + 1} placed successfully for {symbol_name}: {response.json()}")
+                logging.info(f"Order {i + 1} placed successfully for {symbol_name}: {orjson.loads(response.content)}")
             else:
                 logging.error(f"Failed to place order {i + 1} for {symbol_name}: {response.status_code} - {response.text}")
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logging.error(f"Error placing order {i + 1} for {symbol_name}: {e}")
-        time.sleep(1)  # To avoid rate limits
 
 if __name__ == '__main__':
     # Configure Logging with RotatingFileHandler
@@ -1,19 +1,34 @@
 import requests
 import json
-import hashlib
-import hmac
+import orjson
 import time
 import logging
 from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from prettytable import PrettyTable  # Ensure PrettyTable is imported
+from gaiaex_client import TokenBucket, create_hmac_template, create_session
+from gaiaex_meta import fetch_symbols
 
 # Constants
 CONFIG_FILE = 'UID32937591.json'
 BASE_URL = 'https://openapi.gaiaex.com'
 REQUEST_PATH = '/sapi/v1/order'
+DEPTH_PATH = '/sapi/v1/depth'
+BOOK_TICKER_PATH = '/sapi/v1/ticker/bookTicker'
 TOTAL_VOLUME = 15000  # Total amount to buy/sell
 ORDER_COUNT = 1  # Number of market orders to be placed
 THRESHOLD = 1  # Minimum balance threshold for snapshot
+MAX_WORKERS = 16  # Fallback best-bid requests in flight at once
+DEFAULT_PRECISION = {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}  # Shown for assets the symbols list has no precision for
+ORDER_BODY_TEMPLATE = '{"symbolName":"%s","volume":%s,"side":"BUY","type":"MARKET","timestamp":%d,"recvWindow":5000}'  # Market order JSON body; only the symbol, volume and timestamp vary
+
+SESSION = create_session()
+
+ORDER_BUCKET = TokenBucket.for_orders()
+
+# Symbol lookups every balance snapshot needs; filled by the first successful fetch and reused for the rest of the run
+_snapshot_cache = {'precision_by_asset': None, 'symbol_by_asset': None}
 
 def load_config(file):
     try:
@@ -22,15 +37,18 @@ def load_config(file):
         logging.info("Configuration loaded successfully.")
         return config
     except FileNotFoundError:
-        logging.error(f"Configuration file {file} not found.")
+        logging.error("Configuration file %s not found.", file)
         exit()
     except json.JSONDecodeError:
-        logging.error(f"Error decoding JSON from the configuration file {file}.")
+        logging.error("Error decoding JSON from the configuration file %s.", file)
         exit()
 
+# Copies the keyed HMAC prototype cached per secret instead of re-encoding and re-keying on every call
 def generate_signature(secret_key, payload):
-    signature = hmac.new(secret_key.encode(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
-    logging.debug(f"Generated signature: {signature}")
+    h = create_hmac_template(secret_key).copy()
+    h.update(payload.encode('utf-8'))
+    signature = h.hexdigest()
+    logging.debug("Generated signature: %s", signature)
     return signature
 
 def create_headers(api_key, secret_key, timestamp, body):
@@ -41,7 +59,7 @@ def create_headers(api_key, secret_key, timestamp, body):
         'X-CH-TS': str(timestamp),
         'Content-Type': 'application/json'
     }
-    logging.debug(f"Headers created: {headers}")
+    logging.debug("Headers created: %s", headers)
     return headers
 
 def fetch_account_info(api_key, secret_key):
@@ -49,29 +67,28 @@ def fetch_account_info(api_key, secret_key):
     payload = f"{timestamp}GET/sapi/v1/account"
     headers = create_headers(api_key, secret_key, timestamp, "")
     try:
-        response = requests.get(f"{BASE_URL}/sapi/v1/account", headers=headers)
+        response = SESSION.get(f"{BASE_URL}/sapi/v1/account", headers=headers)
         if response.status_code == 200:
             logging.info("Account information fetched successfully.")
-            return response.json()
+            return orjson.loads(response.content)
         else:
-            logging.error(f"Failed to fetch account info: {response.status_code} - {response.text}")
+            logging.error("Failed to fetch account info: %s - %s", response.status_code, response.text)
             return {}
-    except requests.RequestException as e:
-        logging.error(f"Request exception while fetching account info: {e}")
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logging.error("Request exception while fetching account info: %s", e)
         return {}
 
 def fetch_tradable_symbols():
     try:
-        response = requests.get(f"{BASE_URL}/sapi/v1/symbols")
-        if response.status_code != 200:
-            logging.error(f"Failed to fetch pairs list: {response.status_code} - {response.text}")
+        symbols_data = fetch_symbols()  # Shared with fetch_pairs_precision and cached for SYMBOLS_TTL seconds
+        if symbols_data is None:
+            logging.error("Failed to fetch pairs list.")
             return []
-        symbols_data = response.json().get('symbols', [])
         symbols = [
             f"{s['baseAsset']}/{s['quoteAsset']}" for s in symbols_data
             if s['quoteAsset'].upper() == 'USDT' and s['baseAsset'].upper() != 'USDT'
         ]
-        logging.info(f"Fetched {len(symbols)} tradable symbols.")
+        logging.info("Fetched %d tradable symbols.", len(symbols))
 
         # Create the table
         table = PrettyTable()
@@ -79,31 +96,29 @@ def fetch_tradable_symbols():
         for idx, symbol in enumerate(symbols, start=1):
             table.add_row([idx, symbol])
         
-        # Convert table to string
+        # Convert table to string once; the log record and the console share it
         table_str = table.get_string()
 
         # Log the table
-        logging.info("Available Tradable Symbols:\n" + table_str)
+        logging.info("Available Tradable Symbols:\n%s", table_str)
 
         # Optional: Print the table to the console
         print("\nAvailable Tradable Symbols:")
-        print(table)
+        print(table_str)
 
         return symbols
     except requests.RequestException as e:
-        logging.error(f"Request exception while fetching tradable symbols: {e}")
+        logging.error("Request exception while fetching tradable symbols: %s", e)
         return []
 
 def fetch_pairs_precision():
     """Fetch precision details for tradable pairs."""
     try:
-        response = requests.get(f"{BASE_URL}/sapi/v1/symbols")
-        if response.status_code != 200:
-            logging.error(f"Failed to fetch symbol precision data: {response.status_code} - {response.text}")
+        symbols_data = fetch_symbols()
+        if symbols_data is None:
+            logging.error("Failed to fetch symbol precision data.")
             return {}, {}
 
-        symbols_data = response.json().get('symbols', [])
-        
         # Prepare precision data and asset-to-symbol mapping
         precision_data = {}
         asset_to_symbol_map = {}
@@ -133,9 +148,48 @@ def fetch_pairs_precision():
         return precision_data, asset_to_symbol_map
 
     except requests.RequestException as e:
-        logging.error(f"Request exception while fetching precision data: {e}")
+        logging.error("Request exception while fetching precision data: %s", e)
         return {}, {}
 
+def fetch_best_bid(asset):
+    try:
+        response = SESSION.get(f"{BASE_URL}{DEPTH_PATH}", params={'symbol': f"{asset.lower()}usdt1802", 'limit': 1})
+        bids = orjson.loads(response.content).get('bids', []) if response.status_code == 200 else []
+        return float(bids[0][0]) if bids else None
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logging.error("Request exception while fetching best bid for %s: %s", asset, e)
+        return None
+
+# Best bid of every symbol from a single bookTicker request, keyed by lowercase symbol
+def fetch_all_best_bids():
+    try:
+        response = SESSION.get(f"{BASE_URL}{BOOK_TICKER_PATH}")
+        tickers = orjson.loads(response.content) if response.status_code == 200 else []
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logging.error("Request exception while fetching book tickers: %s", e)
+        return {}
+    if not isinstance(tickers, list):  # An error payload; the per-asset depth fallback takes over
+        logging.error("Unexpected book tickers response: %s", tickers)
+        return {}
+    return {t['symbol'].lower(): float(t['bidPrice']) for t in tickers if t.get('bidPrice')}
+
+# Asset -> precision and asset -> symbol mappings, fetched and built once per run
+def snapshot_lookups():
+    if _snapshot_cache['precision_by_asset'] is None:
+        precision_data, asset_to_symbol_map = fetch_pairs_precision()
+        if precision_data:
+            # Keyed by account asset name like symbol_by_asset; a pair-level entry wins over the base-asset one, as before
+            _snapshot_cache['precision_by_asset'] = {
+                f"{base_asset.upper()}1802": precision_data.get(f"{base_asset}1802usdt1802", precision)
+                for base_asset, precision in asset_to_symbol_map.items()
+            }
+    if _snapshot_cache['symbol_by_asset'] is None:
+        tradable_symbols = fetch_tradable_symbols()
+        if tradable_symbols:
+            # Keyed by the account's asset name (base asset + "1802"), so one lookup both filters and maps a balance
+            _snapshot_cache['symbol_by_asset'] = {f"{symbol.split('/')[0].upper()}1802": symbol for symbol in tradable_symbols}
+    return _snapshot_cache['precision_by_asset'] or {}, _snapshot_cache['symbol_by_asset'] or {}
+
 # Create a snapshot of balances
 def balance_snapshot(api_key, secret_key):
     account_info = fetch_account_info(api_key, secret_key)
@@ -143,48 +197,46 @@ def balance_snapshot(api_key, secret_key):
         print("Failed to fetch account information.")
         return
 
-    precision_data, asset_to_symbol_map = fetch_pairs_precision()
-    tradable_symbols = fetch_tradable_symbols()
-    
-    # Create a mapping for base assets to symbols
-    base_asset_to_symbol = {}
-    for symbol in tradable_symbols:
-        base_asset = symbol.split('/')[0].lower()
-        base_asset_to_symbol[base_asset] = symbol
-    
+    precision_by_asset, symbol_by_asset = snapshot_lookups()
+
     account_balances = {b['asset']: float(b['free']) for b in account_info.get('balances', [])}
 
-    rows = []
+    held = []
     for asset, balance in account_balances.items():
-        if balance <= THRESHOLD or not asset.endswith("1802"):
+        # Check if the asset is part of any tradable pair; only "1802" assets are keyed, so this also filters the suffix
+        symbol = symbol_by_asset.get(asset)
+        if balance <= THRESHOLD or symbol is None:
             continue
 
-        # Check if the asset is part of any tradable pair
-        base_asset = asset[:-4].lower()  # Remove the "1802" suffix to get the base asset
-        symbol = base_asset_to_symbol.get(base_asset, None)
+        held.append((asset, balance, symbol))
+
+    # One bookTicker request prices every held asset; only symbols missing from it fall back
+    # to per-asset depth lookups, which go out together over the shared session
+    best_bids = fetch_all_best_bids()
+    bids = {asset: best_bids.get(f"{asset.lower()}usdt1802") for asset, _, _ in held if asset != "USDT1802"}
+    missing = [asset for asset, bid in bids.items() if not bid]
+    if missing:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            bids.update(zip(missing, executor.map(fetch_best_bid, missing)))
+    bids["USDT1802"] = 1.0
 
-        if symbol:
-            bid_price = fetch_best_bid(asset) if asset != "USDT1802" else 1.0
-            value = balance * bid_price if bid_price else 0
-            precision = precision_data.get(f"{asset.lower()}usdt1802", asset_to_symbol_map.get(base_asset, {'pricePrecision': 'N/A', 'quantityPrecision': 'N/A'}))
+    rows = []
+    for asset, balance, symbol in held:
+        bid_price = bids[asset]
+        value = balance * bid_price if bid_price else 0
+        precision = precision_by_asset.get(asset, DEFAULT_PRECISION)
 
-            rows.append({
-                "Asset": asset,
-                "Symbol": symbol,
-                "Free Balance": f"{balance:,.8f}",
-                "Bid Price": f"{bid_price:,.8f}" if bid_price else "N/A",
-                "Value (USDT)": f"{value:,.8f}" if value else "N/A",
-                "Price Precision": precision['pricePrecision'],
-                "Quantity Precision": precision['quantityPrecision']
-            })
+        rows.append((asset, symbol, balance, bid_price, value, precision['pricePrecision'], precision['quantityPrecision']))
 
-    # Sort rows by Value in descending order
-    rows.sort(key=lambda x: float(x["Value (USDT)"].replace(',', '')) if x["Value (USDT)"] != "N/A" else 0, reverse=True)
+    # Sort rows by Value in descending order; values stay floats until the table is rendered
+    rows.sort(key=itemgetter(4), reverse=True)
 
     # Display the data in a PrettyTable
     table = PrettyTable(field_names=["Asset", "Symbol", "Free Balance", "Bid Price", "Value (USDT)", "Price Precision", "Quantity Precision"])
-    for row in rows:
-        table.add_row([row[field] for field in table.field_names])
+    table.add_rows([
+        [asset, symbol, f"{balance:,.8f}", f"{bid_price:,.8f}" if bid_price else "N/A", f"{value:,.8f}" if value else "N/A", price_precision, quantity_precision]
+        for asset, symbol, balance, bid_price, value, price_precision, quantity_precision in rows
+    ])
 
     print("\nAssets with Value > 1 USDT:")
     print(table)
@@ -199,26 +251,20 @@ def place_market_orders(api_key, secret_key, symbol_name):
     balance_snapshot(api_key, secret_key)
 
     for i in range(ORDER_COUNT):
+        ORDER_BUCKET.acquire()  # Before the timestamp, so time spent waiting does not eat into recvWindow
         timestamp = int(time.time() * 1000)
-        params = json.dumps({
-            'symbolName': symbol_name,
-            'volume': per_order_volume,
-            'side': 'BUY',
-            'type': 'MARKET',
-            'timestamp': timestamp,
-            'recvWindow': 5000
-        })
+        params = ORDER_BODY_TEMPLATE % (symbol_name, per_order_volume, timestamp)  # Same string is signed and sent
         headers = create_headers(api_key, secret_key, timestamp, params)
 
         try:
-            response = requests.post(url, headers=headers, data=params)
+            response = SESSION.post(url, headers=headers, data=params)
+            ORDER_BUCKET.sync(response.headers)  # Honour the exchange's remaining quota / Retry-After before the next order
             if response.status_code == 200:
-                logging.info(f"Order {i + 1} placed successfully for {symbol_name}: {response.json()}")
+                logging.info("Order %d placed successfully for %s: %s", i + 1, symbol_name, orjson.loads(response.content))
             else:
-                logging.error(f"Failed to place order {i + 1} for {symbol_name}: {response.status_code} - {response.text}")
-        except requests.RequestException as e:
-            logging.error(f"Error placing order {i + 1} for {symbol_name}: {e}")
-        time.sleep(1)  # To avoid rate limits
+                logging.error("Failed to place order %d for %s: %s - %s", i + 1, symbol_name, response.status_code, response.text)
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            logging.error("Error placing order %d for %s: %s", i + 1, symbol_name, e)
 
     # Take snapshot after placing orders
     logging.info("Taking balance snapshot after executing trades:")
@@ -254,7 +300,7 @@ if __name__ == '__main__':
 
     # Execute trades sequentially on each symbol
     for trade_number, symbol_name in enumerate(tradable_list, start=1):
-        logging.info(f"Trade {trade_number}: Trading symbol {symbol_name}")
+        logging.info("Trade %d: Trading symbol %s", trade_number, symbol_name)
         place_market_orders(api_key, secret_key, symbol_name)
 
     logging.info("Program completed.")
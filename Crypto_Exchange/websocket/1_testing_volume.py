@@ -1,18 +1,27 @@
 import websocket
-import gzip
-import json
+import zlib
+import orjson
 import threading
 
+# Subscribe to BTC/USDT trade ticker
+SUBSCRIPTION_MESSAGE = {
+    "event": "sub",
+    "params": {
+        "channel": "market_btcusdt_trade_ticker",
+        "cb_id": "1"
+    }
+}
+SUBSCRIPTION_FRAME = orjson.dumps(SUBSCRIPTION_MESSAGE)  # Encoded once; every (re)connect sends the same bytes
+
 def on_message(ws, message):
-    # Decompress the Gzip-compressed message
-    decompressed_data = gzip.decompress(message).decode('utf-8')
-    data = json.loads(decompressed_data)
+    # Decompress the Gzip-compressed message in one zlib call (no GzipFile machinery) and parse the bytes directly
+    data = orjson.loads(zlib.decompress(message, wbits=zlib.MAX_WBITS | 16))
     
     # Handle ping messages
     if 'ping' in data:
-        pong_response = json.dumps({'pong': data['ping']})
-        ws.send(pong_response)
-        print(f"Sent pong: {pong_response}")
+        pong_response = orjson.dumps({'pong': data['ping']})
+        ws.send(pong_response, websocket.ABNF.OPCODE_TEXT)
+        print(f"Sent pong: {pong_response.decode()}")
     else:
         print(f"Received data: {data}")
 
@@ -24,16 +33,8 @@ def on_close(ws, close_status_code, close_msg):
 
 def on_open(ws):
     print("Connection opened")
-    # Subscribe to BTC/USDT trade ticker
-    subscription_message = {
-        "event": "sub",
-        "params": {
-            "channel": "market_btcusdt_trade_ticker",
-            "cb_id": "1"
-        }
-    }
-    ws.send(json.dumps(subscription_message))
-    print(f"Sent subscription: {subscription_message}")
+    ws.send(SUBSCRIPTION_FRAME, websocket.ABNF.OPCODE_TEXT)
+    print(f"Sent subscription: {SUBSCRIPTION_MESSAGE}")
 
 if __name__ == "__main__":
     websocket.enableTrace(False)
@@ -51,7 +52,6 @@ if __name__ == "__main__":
     wst.start()
 
     try:
-        while True:
-            pass  # Keep main thread alive
+        wst.join()  # Keep main thread alive; blocks in the kernel instead of spinning a core
     except KeyboardInterrupt:
         ws_app.close()
@@ -1,6 +1,6 @@
 import websocket
-import gzip
-import json
+import zlib
+import orjson
 import threading
 
 # === User Configuration ===
@@ -8,17 +8,26 @@ import threading
 SYMBOL = 'e_btc_usdt'
 # ==========================
 
+# Subscribe to the specified symbol's depth channel
+SUBSCRIPTION_MESSAGE = {
+    "event": "sub",
+    "params": {
+        "channel": f"market_{SYMBOL}_depth_step0",
+        "cb_id": "1"
+    }
+}
+SUBSCRIPTION_FRAME = orjson.dumps(SUBSCRIPTION_MESSAGE)  # Encoded once; every (re)connect sends the same bytes
+
 def on_message(ws, message):
     try:
-        # Decompress the Gzip-compressed message
-        decompressed_data = gzip.decompress(message).decode('utf-8')
-        data = json.loads(decompressed_data)
+        # Decompress the Gzip-compressed message in one zlib call (no GzipFile machinery) and parse the bytes directly
+        data = orjson.loads(zlib.decompress(message, wbits=zlib.MAX_WBITS | 16))
 
         # Handle ping messages to keep the connection alive
         if 'ping' in data:
-            pong_response = json.dumps({'pong': data['ping']})
-            ws.send(pong_response)
-            print(f"Sent pong: {pong_response}")
+            pong_response = orjson.dumps({'pong': data['ping']})
+            ws.send(pong_response, websocket.ABNF.OPCODE_TEXT)
+            print(f"Sent pong: {pong_response.decode()}")
         elif 'tick' in data:
             tick = data['tick']
             bids = tick.get('buys', [])
@@ -44,16 +53,8 @@ def on_close(ws, close_status_code, close_msg):
 
 def on_open(ws):
     print("Connection opened")
-    # Subscribe to the specified symbol's depth channel
-    subscription_message = {
-        "event": "sub",
-        "params": {
-            "channel": f"market_{SYMBOL}_depth_step0",
-            "cb_id": "1"
-        }
-    }
-    ws.send(json.dumps(subscription_message))
-    print(f"Sent subscription: {subscription_message}")
+    ws.send(SUBSCRIPTION_FRAME, websocket.ABNF.OPCODE_TEXT)
+    print(f"Sent subscription: {SUBSCRIPTION_MESSAGE}")
 
 if __name__ == "__main__":
     websocket.enableTrace(False)
@@ -71,7 +72,6 @@ if __name__ == "__main__":
     wst.start()
 
     try:
-        while True:
-            pass  # Keep main thread alive
+        wst.join()  # Keep main thread alive; blocks in the kernel instead of spinning a core
     except KeyboardInterrupt:
         ws_app.close()
@@ -1,6 +1,9 @@
 import os
 import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import pandas as pd
 from pprint import pprint
 from prettytable import PrettyTable
 import ray
@@ -38,6 +41,7 @@ CUT_LOSS = -25
 STOP_OUT = 50
 TRAILING_STOP = 0.1
 HWM_DROP = 0.15
+NUM_EVAL_WORKERS = 4  # Backtest episodes evaluated concurrently, each on its own env
 
 # python3 20240126_discrete_loading_impala_LSTM.py > output_20260108_300nop_100K_2012_Q1.txt
 
@@ -76,7 +80,7 @@ default_path = data_paths[0]
 
 def env_creator(env_config):
     path = env_config.get("path", default_path)
-    return MarginTradingEnv(path)
+    return MarginTradingEnv(path, frames=env_config.get("frames"))
 
 # Register the environment with Ray
 register_env("MarginTradingEnv-v0", env_creator)
@@ -144,8 +148,8 @@ def print_trades_as_table(trades):
     table = PrettyTable()
     table.field_names = ["Time", "Side", "Symbol", "Price", "Quantity", "Trade Cost", "Trade Profit"]
 
-    for trade in trades:
-        table.add_row([
+    table.add_rows([
+        [
             trade["time"],
             trade["side"],
             trade["symbol"],
@@ -153,7 +157,9 @@ def print_trades_as_table(trades):
             trade["quantity"],
             f"{trade['trade_cost']:.2f}",
             f"{trade['trade_profit']:.2f}"
-        ])
+        ]
+        for trade in trades
+    ])
 
     print(table)
 
@@ -165,11 +171,11 @@ def print_records_as_table(records, OHLCV_df):
                          "Sortino Ratio", "Reward", "Avg Price", "Spot Price", "Floating Profit", 
                          "Trade Not Executed", "Stopped Out"]
 
-    for record in records:
-        # Fetching timestamp from the index
-        timestamp = OHLCV_df.index[record["timestep"]]
+    # Fetching every timestamp from the index in one indexing call
+    timestamps = OHLCV_df.index[[record["timestep"] for record in records]]
 
-        table.add_row([
+    table.add_rows([
+        [
             record["timestep"],
             timestamp,
             f"{record['equity']:.2f}",
@@ -192,106 +198,110 @@ def print_records_as_table(records, OHLCV_df):
             f"{record['Floating_Profit']:.2f}",
             record["trade_not_executed"],
             record["stopped_out"]
-        ])
+        ]
+        for record, timestamp in zip(records, timestamps)
+    ])
 
     print(table)
 
-def print_combined_trades_and_records_as_table(trades, records, OHLCV_df):
-    table = PrettyTable()
-    table.field_names = ["Timecount", "Timestep", "Timestamp", "Side", "Symbol", "Price", "Quantity", "Trade Cost", "Trade Profit",
-                         "Equity", "Balance", "NOP", "Realized PnL", "Unrealized PnL",
-                         "Accumulated Cost", "Margin Required", "Margin Free", "Margin Level",
-                         "Portfolio Leverage", "Return Percentage", "Log Return", "Max Drawdown",
-                         "Sortino Ratio", "Reward", "Avg Price", "Spot Price", "Floating Profit",
-                         "Trade Not Executed", "Stopped Out"]
-
-    # Create a dictionary for faster lookup of records by timestep
-    records_by_time = {record['timestep']: record for record in records}
-
-    for trade in trades:
-        timestep = trade["time"]
-        record = records_by_time.get(timestep)
-
-        # Fetching timestamp from the index
-        timestamp = OHLCV_df.index[timestep]
-
-        # If there's a corresponding record for this trade, include it in the table
-        if record:
-            table.add_row([
-                record["timecount"],
-                timestep,
-                timestamp,
-                trade["side"],
-                trade["symbol"],
-                trade["price"],
-                trade["quantity"],
-                f"{trade['trade_cost']:.0f}",
-                f"{trade['trade_profit']:.0f}",
-                f"{record['equity']:.0f}",
-                f"{record['balance']:.0f}",
-                f"{record['nop']:.0f}",
-                f"{record['realized_pnl']:.0f}",
-                f"{record['unrealized_pnl']:.0f}",
-                f"{record['accumulated_cost']:.2f}",
-                f"{record['margin_required']:.2f}",
-                f"{record['margin_free']:.2f}",
-                f"{record['margin_level']:.2f}",
-                f"{record['portfolio_leverage']:.2f}",
-                f"{record['return_percentage']:.2f}",
-                f"{record['log_return']:.2f}",
-                f"{record['max_drawdown']:.2f}",
-                f"{record['sortino_ratio']:.2f}",
-                f"{record['reward']:.6f}",
-                f"{record['avg_price']:.5f}",
-                f"{record['spot_price']:.5f}",
-                f"{record['Floating_Profit']:.0f}",
-                record["trade_not_executed"],
-                record["stopped_out"]
-            ])
+# (header, trade/record field, format) for each column of the combined table; None prints the value as is
+COMBINED_TABLE_COLUMNS = [
+    ("Timecount", "timecount", None), ("Timestep", "time", None), ("Timestamp", "timestamp", None),
+    ("Side", "side", None), ("Symbol", "symbol", None), ("Price", "price", None), ("Quantity", "quantity", None),
+    ("Trade Cost", "trade_cost", "{:.0f}"), ("Trade Profit", "trade_profit", "{:.0f}"),
+    ("Equity", "equity", "{:.0f}"), ("Balance", "balance", "{:.0f}"), ("NOP", "nop", "{:.0f}"),
+    ("Realized PnL", "realized_pnl", "{:.0f}"), ("Unrealized PnL", "unrealized_pnl", "{:.0f}"),
+    ("Accumulated Cost", "accumulated_cost", "{:.2f}"), ("Margin Required", "margin_required", "{:.2f}"),
+    ("Margin Free", "margin_free", "{:.2f}"), ("Margin Level", "margin_level", "{:.2f}"),
+    ("Portfolio Leverage", "portfolio_leverage", "{:.2f}"), ("Return Percentage", "return_percentage", "{:.2f}"),
+    ("Log Return", "log_return", "{:.2f}"), ("Max Drawdown", "max_drawdown", "{:.2f}"),
+    ("Sortino Ratio", "sortino_ratio", "{:.2f}"), ("Reward", "reward", "{:.6f}"),
+    ("Avg Price", "avg_price", "{:.5f}"), ("Spot Price", "spot_price", "{:.5f}"),
+    ("Floating Profit", "Floating_Profit", "{:.0f}"),
+    ("Trade Not Executed", "trade_not_executed", None), ("Stopped Out", "stopped_out", None),
+]
+TRADE_FIELDS = ["time", "side", "symbol", "price", "quantity", "trade_cost", "trade_profit"]
+RECORD_FIELDS = ["timestep"] + [field for _, field, _ in COMBINED_TABLE_COLUMNS if field not in TRADE_FIELDS and field != "timestamp"]
 
-    print(table)
+def print_combined_trades_and_records_as_table(trades, records, OHLCV_df):
+    # Join every trade to the record of its timestep in one pass (the latest record wins, as a dict lookup would),
+    # format whole columns at once and render the table with a single to_string call
+    trades_df = pd.DataFrame(trades, columns=TRADE_FIELDS)
+    records_df = pd.DataFrame(records, columns=RECORD_FIELDS).drop_duplicates("timestep", keep="last").set_index("timestep")
+    joined = trades_df.join(records_df, on="time", how="inner")  # Trades without a record are dropped
+
+    # Fetching timestamps from the index
+    joined["timestamp"] = OHLCV_df.index[joined["time"].to_numpy(dtype=np.int64)]
+
+    table = pd.DataFrame({
+        header: joined[field].map(fmt.format) if fmt else joined[field]
+        for header, field, fmt in COMBINED_TABLE_COLUMNS
+    })
+    print(table.to_string(index=False))
+
+def run_episode(policy, env):
+    state, info = env.reset()
+    terminated = False
+    truncated = False
+    episode_reward = 0
+    lstm_state = policy.get_initial_state()
+    obs = np.empty((1, state.size), dtype=np.float32)  # Refilled in place every step instead of reallocated
+
+    while not (terminated or truncated):
+        # compute_single_action batches and converts the observation itself, so a float32 NumPy array is
+        # all it needs; building an eager tensor and an input dict here only added work on every step
+        np.copyto(obs, state.reshape(1, -1), casting='unsafe')
+        # Using the action output directly; the LSTM state arrays it returns are fed straight back next step
+        action, lstm_state, _ = policy.compute_single_action(obs, state=lstm_state)
+        
+        # Assuming the new action space returns [terminated, truncated] as third and fourth elements
+        state, reward, terminated, truncated, info = env.step(action)
+        
+        episode_reward += reward
 
-import tensorflow as tf
+    return episode_reward, info
 
-def run_trained_model(agent, env, num_episodes):
+def run_trained_model(agent, envs, num_episodes):
+    # Episodes are independent, so they run concurrently, one per env; TF inference and NumPy release the GIL.
+    # Each worker takes an idle env for the whole episode, and results are printed in episode order
     policy = agent.get_policy()
-    for i in range(num_episodes):
-        state, info = env.reset()
-        terminated = False
-        truncated = False
-        episode_reward = 0
-        lstm_state = policy.get_initial_state()
-
-        while not (terminated or truncated):
-            state_flat = state.astype(np.float32)
-            input_dict = {
-                "obs": tf.reshape(tf.convert_to_tensor(state_flat), (1, -1)),
-                "is_training": False,
-            }
-            # Using the action output directly
-            action, new_lstm_state, _ = policy.compute_single_action(input_dict['obs'], state=lstm_state)
-            
-            # Assuming the new action space returns [terminated, truncated] as third and fourth elements
-            state, reward, terminated, truncated, info = env.step(action)
+    idle_envs = queue.SimpleQueue()
+    for env in envs:
+        idle_envs.put(env)
+
+    def run_on_idle_env(_):
+        env = idle_envs.get()
+        try:
+            episode_reward, info = run_episode(policy, env)
+            return episode_reward, info['closed_trades'], info['record'], dict(info['account_info']), env.OHLCV_df
+        finally:
+            idle_envs.put(env)
+
+    with ThreadPoolExecutor(max_workers=len(envs)) as executor:
+        for i, (episode_reward, closed_trades, record, account_info, OHLCV_df) in enumerate(executor.map(run_on_idle_env, range(num_episodes))):
+            print_combined_trades_and_records_as_table(closed_trades, record, OHLCV_df)
             
-            lstm_state = new_lstm_state
-            episode_reward += reward
-        
-        print_combined_trades_and_records_as_table(info['closed_trades'], info['record'], env.OHLCV_df)
-        
-        pprint(info['account_info'])
-        print(f"Episode {i + 1}, Reward: {episode_reward}")
+            pprint(account_info)
+            print(f"Episode {i + 1}, Reward: {episode_reward}")
 
 # Load the trained model from the checkpoint
 agent = load_trained_model(checkpoint_path, config)
 
+# One environment per evaluation worker, built once and pointed at each data_path in turn.
+# Each file is parsed by the first env only; the others share its frames
+envs = [env_creator({"path": data_paths[0]})]
+envs += [env_creator({"path": data_paths[0], "frames": envs[0].frames}) for _ in range(NUM_EVAL_WORKERS - 1)]
+
 # Loop through the data_paths
 for data_path in data_paths:
     print(f"Evaluating on data from {data_path}")
     
-    # Create the environment with the current data_path
-    env = env_creator({"path": data_path})
+    # Swap the current data_path into the existing environments; every episode starts with reset()
+    if data_path != data_paths[0]:
+        frames = envs[0].read_frames(data_path)
+        for env in envs:
+            env.use_frames(frames)
 
     # Test the trained model
     num_episodes = 30
-    run_trained_model(agent, env, num_episodes)
\ No newline at end of file
+    run_trained_model(agent, envs, num_episodes)
@@ -1,40 +1,22 @@
 # Training Env
 class MarginTradingEnv(gym.Env):
       
-    def __init__(self, file_path, leverage=LEVERAGE, initial_balance=INITIAL_BALANCE, risk_free_rate=RISK_FREE_RATE, unit=UNIT, env_debug=False, sim_debug=False):
+    def __init__(self, file_path, leverage=LEVERAGE, initial_balance=INITIAL_BALANCE, risk_free_rate=RISK_FREE_RATE, unit=UNIT, env_debug=False, sim_debug=False, frames=None):
         
         super(MarginTradingEnv, self).__init__()
                 
         self.debug = env_debug
 
-        raw_df = pd.read_csv(file_path)
-        
-        raw_df = raw_df.fillna(method='ffill')
-        raw_df = raw_df.dropna()
-
-
-        self.OHLCV_df = process_raw_data(raw_df.copy(), '1min')
-        
-        self.OHLCV_df = self.OHLCV_df.fillna(method='ffill')
-        self.OHLCV_df = self.OHLCV_df.dropna()
-        
-        # print(self.OHLCV_df)
-
-
-        self.signal_df = self.calculate_all_signals(raw_df)
-                
-        self.signal_df = self.signal_df.fillna(method='ffill')
-        self.signal_df = self.signal_df.dropna()
-        
-        self.simulator = MarginTradeSimulator(
-            self.OHLCV_df['Close'], leverage, initial_balance, risk_free_rate, sim_debug)   
+        self.simulator_args = (leverage, initial_balance, risk_free_rate, sim_debug)
+        # frames another env already read from file_path skip parsing it again
+        self.use_frames(frames if frames is not None else self.read_frames(file_path))
            
         self.unit = unit
         
         self.action_space = Discrete(201)  # 100 in positive, 100 in negative direction, and 0
         
         num_summary_fields = 6
-        obs_space_shape = (len(self.calculate_price_df(self.OHLCV_df).columns) + len(self.signal_df.columns) +
+        obs_space_shape = (len(self.price_df.columns) + len(self.signal_df.columns) +
                            len(self.simulator.account_info) + len(self.simulator.open_positions) + num_summary_fields,)
         
         self.observation_space = spaces.Box(
@@ -47,15 +29,80 @@ class MarginTradingEnv(gym.Env):
         self.hwm = initial_balance  # Start with the initial balance as the first HWM
         self.equity_drop_threshold = HWM_DROP  # 30% drop threshold
 
+    # Point the env at another data file without rebuilding it; the spaces stay as they are,
+    # so every file must produce the same columns. Takes effect from the next reset()
+    def load_path(self, file_path):
+        self.use_frames(self.read_frames(file_path))
+
+    # Parse a data file and derive everything step() and reset() read from it: the OHLCV, signal and
+    # ATR-normalised price frames, plain arrays of both observation frames for positional row access,
+    # and the candidate episode starts
+    def read_frames(self, file_path):
+        raw_df = self.read_price_file(file_path)
+        
+        raw_df = raw_df.fillna(method='ffill')
+        raw_df = raw_df.dropna()
+
+
+        OHLCV_df = process_raw_data(raw_df.copy(), '1min')
+        
+        OHLCV_df = OHLCV_df.fillna(method='ffill')
+        OHLCV_df = OHLCV_df.dropna()
+        
+        # print(OHLCV_df)
+
+
+        signal_df = self.calculate_all_signals(raw_df)
+                
+        signal_df = signal_df.fillna(method='ffill')
+        signal_df = signal_df.dropna()
+
+        price_df = self.calculate_price_df(OHLCV_df)
+        start_indices = np.flatnonzero(OHLCV_df.index == OHLCV_df.index.normalize()).tolist()
+        return OHLCV_df, signal_df, price_df, price_df.to_numpy(), signal_df.to_numpy(), start_indices
+
+    # Switch to frames from read_frames(). They are only ever read, so envs evaluating the same file can
+    # share one set; each env still trades on its own simulator
+    def use_frames(self, frames):
+        self.frames = frames
+        self.OHLCV_df, self.signal_df, self.price_df, self.price_values, self.signal_values, self.start_indices = frames
+        self.simulator = MarginTradeSimulator(self.OHLCV_df['Close'], *self.simulator_args)
+
+    # load_path() followed by a fresh episode on the new data
+    def reset_to_path(self, file_path, *, seed=None, options=None):
+        self.load_path(file_path)
+        return self.reset(seed=seed, options=options)
+
+    # Read a data file, preferring the typed parquet copy an earlier run saved next to it over re-tokenizing the CSV.
+    # The copy is used only while it is at least as new as the CSV; one that cannot be read is reported and the CSV used.
+    # Without a parquet engine (pyarrow/fastparquet) the CSV is simply read every time
+    @staticmethod
+    def read_price_file(file_path):
+        parquet_path = file_path.rsplit('.', 1)[0] + '.parquet'
+        try:
+            if os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+                return pd.read_parquet(parquet_path)
+        except FileNotFoundError:
+            pass  # No copy saved yet
+        except (OSError, ImportError, ValueError) as e:  # pyarrow's ArrowInvalid/ArrowIOError derive from these
+            reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+            print(f"Warning: unreadable parquet copy {parquet_path} ({reason}), reading {file_path} instead")
+        raw_df = pd.read_csv(file_path)
+        try:
+            # Written to a temp file first so a concurrent or interrupted run never leaves a partial copy behind
+            temp_path = f"{parquet_path}.{os.getpid()}.tmp"
+            raw_df.to_parquet(temp_path)
+            os.replace(temp_path, parquet_path)
+        except (OSError, ImportError, ValueError):
+            pass  # An unwritable cache only costs the next run a CSV parse
+        return raw_df
+
     def reset(self, *, seed=None, options=None):
         
         self.simulator.reset()
 
-        # Collect indices of timestamps with time 00:01:00
-        start_indices = []
-        for idx, timestamp in enumerate(self.OHLCV_df.index):
-            if timestamp.time() == datetime.time(0, 0):
-                start_indices.append(idx)
+        # Indices of timestamps with time 00:00:00 are collected by load_path()
+        start_indices = self.start_indices
 
         # Randomly choose an index from the start_indices
         if start_indices:
@@ -64,7 +111,7 @@ class MarginTradingEnv(gym.Env):
             self.simulator.timestep = chosen_index
         else:
             # If no indices with time 00:01:00 are found, start from the first non-NaN value as before
-            first_valid_index = max(self.signal_df.reset_index().index[0], self.calculate_price_df(self.OHLCV_df).reset_index().index[0])
+            first_valid_index = max(self.signal_df.reset_index().index[0], self.price_df.reset_index().index[0])
             self.simulator.timestep = first_valid_index
 
         # Extract timestamp (assuming the timestamp is in a column named 'Time')
@@ -100,9 +147,9 @@ class MarginTradingEnv(gym.Env):
         # Get Kijun signals
         # signal_Tenkan_Kijun_4hour = self.signal_df.loc[current_timestamp, 'signal_Tenkan_Kijun_4hour']
         # signal_Close_SpanAB_4hour = self.signal_df.loc[current_timestamp, 'signal_Close_SpanAB_4hour']
-        signal_MACD_histogram_4hour = self.signal_df.loc[current_timestamp, 'signal_MACD_histogram_4hour']
+        signal_MACD_histogram_4hour = self.signal_df.at[current_timestamp, 'signal_MACD_histogram_4hour']
         # signal_GMMA_3_60_4hour = self.signal_df.loc[current_timestamp, 'signal_GMMA_3_60_4hour']
-        signal_bbstop_4hour = self.signal_df.loc[current_timestamp, 'signal_bbstop_4hour']
+        signal_bbstop_4hour = self.signal_df.at[current_timestamp, 'signal_bbstop_4hour']
         # signal_AO_4hour = self.signal_df.loc[current_timestamp, 'signal_AO_4hour']
 
         # Determine action type based on Kijun signals, percentage, and current NOP
@@ -218,8 +265,7 @@ class MarginTradingEnv(gym.Env):
 
     def render(self, mode='human', action=None, reward=None):
 
-        current_price_data = self.calculate_price_df(
-            self.OHLCV_df).iloc[self.simulator.timestep]
+        current_price_data = self.price_df.iloc[self.simulator.timestep]
         current_signal_data = self.signal_df.iloc[self.simulator.timestep]
 
         print("#" * 100)
@@ -286,10 +332,10 @@ class MarginTradingEnv(gym.Env):
 
     def _get_observation(self):
         # Get current price data
-        current_price_data = self.calculate_price_df(self.OHLCV_df).iloc[self.simulator.timestep].values
+        current_price_data = self.price_values[self.simulator.timestep]
 
         # Get current signal data
-        current_signal_data = self.signal_df.iloc[self.simulator.timestep].values
+        current_signal_data = self.signal_values[self.simulator.timestep]
 
         # Get account_info data
         account_info_data = np.array(list(self.simulator.account_info.values()))
@@ -1,3 +1,4 @@
+import os
 import json
 import datetime
 import time
@@ -1151,40 +1152,22 @@ class MarginTradeSimulator:
 # Training Env
 class MarginTradingEnv(gym.Env):
       
-    def __init__(self, file_path, leverage=LEVERAGE, initial_balance=INITIAL_BALANCE, risk_free_rate=RISK_FREE_RATE, unit=UNIT, env_debug=False, sim_debug=False):
+    def __init__(self, file_path, leverage=LEVERAGE, initial_balance=INITIAL_BALANCE, risk_free_rate=RISK_FREE_RATE, unit=UNIT, env_debug=False, sim_debug=False, frames=None):
         
         super(MarginTradingEnv, self).__init__()
                 
         self.debug = env_debug
 
-        raw_df = pd.read_csv(file_path)
-        
-        raw_df = raw_df.fillna(method='ffill')
-        raw_df = raw_df.dropna()
-
-
-        self.OHLCV_df = process_raw_data(raw_df.copy(), '1min')
-        
-        self.OHLCV_df = self.OHLCV_df.fillna(method='ffill')
-        self.OHLCV_df = self.OHLCV_df.dropna()
-        
-        # print(self.OHLCV_df)
-
-
-        self.signal_df = self.calculate_all_signals(raw_df)
-                
-        self.signal_df = self.signal_df.fillna(method='ffill')
-        self.signal_df = self.signal_df.dropna()
-        
-        self.simulator = MarginTradeSimulator(
-            self.OHLCV_df['Close'], leverage, initial_balance, risk_free_rate, sim_debug)   
+        self.simulator_args = (leverage, initial_balance, risk_free_rate, sim_debug)
+        # frames another env already read from file_path skip parsing it again
+        self.use_frames(frames if frames is not None else self.read_frames(file_path))
            
         self.unit = unit
         
         self.action_space = Discrete(201)  # 100 in positive, 100 in negative direction, and 0
         
         num_summary_fields = 6
-        obs_space_shape = (len(self.calculate_price_df(self.OHLCV_df).columns) + len(self.signal_df.columns) +
+        obs_space_shape = (len(self.price_df.columns) + len(self.signal_df.columns) +
                            len(self.simulator.account_info) + len(self.simulator.open_positions) + num_summary_fields,)
         
         self.observation_space = spaces.Box(
@@ -1197,15 +1180,80 @@ class MarginTradingEnv(gym.Env):
         self.hwm = initial_balance  # Start with the initial balance as the first HWM
         self.equity_drop_threshold = HWM_DROP  # 30% drop threshold
 
+    # Point the env at another data file without rebuilding it; the spaces stay as they are,
+    # so every file must produce the same columns. Takes effect from the next reset()
+    def load_path(self, file_path):
+        self.use_frames(self.read_frames(file_path))
+
+    # Parse a data file and derive everything step() and reset() read from it: the OHLCV, signal and
+    # ATR-normalised price frames, plain arrays of both observation frames for positional row access,
+    # and the candidate episode starts
+    def read_frames(self, file_path):
+        raw_df = self.read_price_file(file_path)
+        
+        raw_df = raw_df.fillna(method='ffill')
+        raw_df = raw_df.dropna()
+
+
+        OHLCV_df = process_raw_data(raw_df.copy(), '1min')
+        
+        OHLCV_df = OHLCV_df.fillna(method='ffill')
+        OHLCV_df = OHLCV_df.dropna()
+        
+        # print(OHLCV_df)
+
+
+        signal_df = self.calculate_all_signals(raw_df)
+                
+        signal_df = signal_df.fillna(method='ffill')
+        signal_df = signal_df.dropna()
+
+        price_df = self.calculate_price_df(OHLCV_df)
+        start_indices = np.flatnonzero(OHLCV_df.index == OHLCV_df.index.normalize()).tolist()
+        return OHLCV_df, signal_df, price_df, price_df.to_numpy(), signal_df.to_numpy(), start_indices
+
+    # Switch to frames from read_frames(). They are only ever read, so envs evaluating the same file can
+    # share one set; each env still trades on its own simulator
+    def use_frames(self, frames):
+        self.frames = frames
+        self.OHLCV_df, self.signal_df, self.price_df, self.price_values, self.signal_values, self.start_indices = frames
+        self.simulator = MarginTradeSimulator(self.OHLCV_df['Close'], *self.simulator_args)
+
+    # load_path() followed by a fresh episode on the new data
+    def reset_to_path(self, file_path, *, seed=None, options=None):
+        self.load_path(file_path)
+        return self.reset(seed=seed, options=options)
+
+    # Read a data file, preferring the typed parquet copy an earlier run saved next to it over re-tokenizing the CSV.
+    # The copy is used only while it is at least as new as the CSV; one that cannot be read is reported and the CSV used.
+    # Without a parquet engine (pyarrow/fastparquet) the CSV is simply read every time
+    @staticmethod
+    def read_price_file(file_path):
+        parquet_path = file_path.rsplit('.', 1)[0] + '.parquet'
+        try:
+            if os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+                return pd.read_parquet(parquet_path)
+        except FileNotFoundError:
+            pass  # No copy saved yet
+        except (OSError, ImportError, ValueError) as e:  # pyarrow's ArrowInvalid/ArrowIOError derive from these
+            reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+            print(f"Warning: unreadable parquet copy {parquet_path} ({reason}), reading {file_path} instead")
+        raw_df = pd.read_csv(file_path)
+        try:
+            # Written to a temp file first so a concurrent or interrupted run never leaves a partial copy behind
+            temp_path = f"{parquet_path}.{os.getpid()}.tmp"
+            raw_df.to_parquet(temp_path)
+            os.replace(temp_path, parquet_path)
+        except (OSError, ImportError, ValueError):
+            pass  # An unwritable cache only costs the next run a CSV parse
+        return raw_df
+
     def reset(self, *, seed=None, options=None):
         
         self.simulator.reset()
 
-        # Collect indices of timestamps with time 00:01:00
-        start_indices = []
-        for idx, timestamp in enumerate(self.OHLCV_df.index):
-            if timestamp.time() == datetime.time(0, 0):
-                start_indices.append(idx)
+        # Indices of timestamps with time 00:00:00 are collected by load_path()
+        start_indices = self.start_indices
 
         # Randomly choose an index from the start_indices
         if start_indices:
@@ -1214,7 +1262,7 @@ class MarginTradingEnv(gym.Env):
             self.simulator.timestep = chosen_index
         else:
             # If no indices with time 00:01:00 are found, start from the first non-NaN value as before
-            first_valid_index = max(self.signal_df.reset_index().index[0], self.calculate_price_df(self.OHLCV_df).reset_index().index[0])
+            first_valid_index = max(self.signal_df.reset_index().index[0], self.price_df.reset_index().index[0])
             self.simulator.timestep = first_valid_index
 
         # Extract timestamp (assuming the timestamp is in a column named 'Time')
@@ -1250,9 +1298,9 @@ class MarginTradingEnv(gym.Env):
         # Get Kijun signals
         # signal_Tenkan_Kijun_4hour = self.signal_df.loc[current_timestamp, 'signal_Tenkan_Kijun_4hour']
         # signal_Close_SpanAB_4hour = self.signal_df.loc[current_timestamp, 'signal_Close_SpanAB_4hour']
-        signal_MACD_histogram_4hour = self.signal_df.loc[current_timestamp, 'signal_MACD_histogram_4hour']
+        signal_MACD_histogram_4hour = self.signal_df.at[current_timestamp, 'signal_MACD_histogram_4hour']
         # signal_GMMA_3_60_4hour = self.signal_df.loc[current_timestamp, 'signal_GMMA_3_60_4hour']
-        signal_bbstop_4hour = self.signal_df.loc[current_timestamp, 'signal_bbstop_4hour']
+        signal_bbstop_4hour = self.signal_df.at[current_timestamp, 'signal_bbstop_4hour']
         # signal_AO_4hour = self.signal_df.loc[current_timestamp, 'signal_AO_4hour']
 
         # Determine action type based on Kijun signals, percentage, and current NOP
@@ -1368,8 +1416,7 @@ class MarginTradingEnv(gym.Env):
 
     def render(self, mode='human', action=None, reward=None):
 
-        current_price_data = self.calculate_price_df(
-            self.OHLCV_df).iloc[self.simulator.timestep]
+        current_price_data = self.price_df.iloc[self.simulator.timestep]
         current_signal_data = self.signal_df.iloc[self.simulator.timestep]
 
         print("#" * 100)
@@ -1436,10 +1483,10 @@ class MarginTradingEnv(gym.Env):
 
     def _get_observation(self):
         # Get current price data
-        current_price_data = self.calculate_price_df(self.OHLCV_df).iloc[self.simulator.timestep].values
+        current_price_data = self.price_values[self.simulator.timestep]
 
         # Get current signal data
-        current_signal_data = self.signal_df.iloc[self.simulator.timestep].values
+        current_signal_data = self.signal_values[self.simulator.timestep]
 
         # Get account_info data
         account_info_data = np.array(list(self.simulator.account_info.values()))
@@ -1533,8 +1580,25 @@ class MarginTradingEnv(gym.Env):
  
         return episodes            
            
+# Memoize an exchange fetcher for the current timestep: the first call in a step hits the API, later calls
+# in the same step (observation, reward, trade checks) reuse the result. Orders clear the cache explicitly
+def _per_step_cache(fn):
+    def cached(self, *args):
+        key = (fn.__name__,) + args
+        hit = self._obs_cache.get(key)
+        if hit is not None and hit[0] == self.timestep:
+            return hit[1]
+        value = fn(self, *args)
+        self._obs_cache[key] = (self.timestep, value)
+        return value
+    return cached
+
 # Live Env        
 class LiveMarginTradingEnv(gym.Env):
+
+    OHLCV_TIMEFRAMES = ('1m', '5m', '15m', '1h', '1d')  # Every timeframe the signals and price frame are built from
+    OHLCV_TTL = {'1m': 60, '5m': 300, '15m': 900, '1h': 3600, '1d': 86400}  # Bar length in seconds; closed candles are reused, see _store_ohlcv
+    OHLCV_LIMIT = 120  # Candles kept per timeframe
     
     def __init__(self, public_key, secret_key, symbol):
         super(LiveMarginTradingEnv, self).__init__()
@@ -1546,6 +1610,15 @@ class LiveMarginTradingEnv(gym.Env):
             'enableRateLimit': True
         })
         self.exchange.set_sandbox_mode(True)
+
+        # Async twin of self.exchange, driven on a private event loop by _prefetch()
+        self._loop = asyncio.new_event_loop()
+        self.async_exchange = ccxtpro.bybit({
+            'apiKey': public_key,
+            'secret': secret_key,
+            'enableRateLimit': True
+        })
+        self.async_exchange.set_sandbox_mode(True)
         
         # Initialize the session
         self.session = HTTP(
@@ -1564,7 +1637,7 @@ class LiveMarginTradingEnv(gym.Env):
         # Initialize historical data
         self.equity_history = [self.initial_balance]  # Start with initial balance
         self.return_history = [0]  # Start with no return
-        self.drawdowns = [0]  # Start with no drawdown
+        self._metrics_history = None  # The equity_history list the running metrics were built from
         
         # Initialize performance metrics
         self.max_drawdown = 0
@@ -1575,6 +1648,11 @@ class LiveMarginTradingEnv(gym.Env):
         self.avg_price = 0  # Average price
         self.spot_price = 0  # Current spot price
 
+        self._obs_cache = {}  # (fetcher name, *args) -> (timestep, result), see _per_step_cache
+        self._ohlcv_cache = {}  # timeframe -> (Unix time until which a two-candle refresh still overlaps, raw candles, timestep refreshed), see _store_ohlcv
+        self._signals_cache = {}  # timeframe -> (raw candles, signals computed from them)
+        self._price_df_cache = (None, None)  # (raw daily candles, price frame computed from them)
+
         # Dummy observation space for now
         self.action_space = Discrete(201)  # 100 in positive, 100 in negative direction, and 0
         
@@ -1644,16 +1722,25 @@ class LiveMarginTradingEnv(gym.Env):
         print(f"Converted action {action} to value: {value}")
         return value
 
+    @_per_step_cache
     def _calculate_and_concatenate_signals(self):
-        timeframes = ['1m', '5m', '15m', '1h', '1d']
+        timeframes = self.OHLCV_TIMEFRAMES
         signals_dfs = []
 
         for tf in timeframes:
+            # Candles unchanged since the last call give the same signals
+            ohlcv = self._fetch_ohlcv(tf)
+            cached = self._signals_cache.get(tf)
+            if cached is not None and cached[0] is ohlcv:
+                signals_dfs.append(cached[1])
+                continue
+
             ohlcv_df = self._fetch_ohlcv_data(tf)
             # Adjust the timeframe format to match the process_raw_data() function
             adjusted_tf = tf.replace('m', 'min').replace('h', 'hour').replace('d', 'day')
             processed_df = process_raw_data(ohlcv_df, adjusted_tf)
             signals_df = calculate_signals(processed_df, adjusted_tf)
+            self._signals_cache[tf] = (ohlcv, signals_df)
             signals_dfs.append(signals_df)
 
         concatenated_signals_df = pd.concat(signals_dfs, axis=1)
@@ -1663,26 +1750,21 @@ class LiveMarginTradingEnv(gym.Env):
         return concatenated_signals_df
       
     def _calculate_nop(self, positions):
-        nop = 0
-        for position in positions:
-            if position['symbol'] == 'BTC/USDT:USDT':
-                contracts = float(position['contracts'])
-                entry_price = float(position['entryPrice'])
-                side = position['info']['side']
-                
-                if side == 'Buy':
-                    nop += contracts * entry_price
-                elif side == 'Sell':
-                    nop -= contracts * entry_price
-        return nop
+        return self._position_stats(positions, 'BTC/USDT:USDT')['nop']
 
+    @_per_step_cache
     def _calculate_price_df(self):
         
+        # While the daily candles are unchanged the ATR and normalised prices come out the same
+        ohlcv = self._fetch_ohlcv('1d')
+        if self._price_df_cache[0] is ohlcv:
+            return self._price_df_cache[1]
+
         input_df = self._fetch_ohlcv_data('1d')
         price_df = input_df.copy()
         
         price_df['Time'] = pd.to_datetime(price_df['Time'], format='%Y.%m.%d %H:%M:%S')
-        price_df['Time'] = price_df['Time'].apply(lambda x: x.replace(second=0))
+        price_df['Time'] -= pd.to_timedelta(price_df['Time'].dt.second, unit='s')  # Same as x.replace(second=0), for the whole column at once
         price_df.set_index('Time', inplace=True)
         
         price_df.drop('Volume', axis=1, inplace=True)
@@ -1700,6 +1782,7 @@ class LiveMarginTradingEnv(gym.Env):
         
         price_df = price_df.fillna(method='ffill').dropna()
 
+        self._price_df_cache = (ohlcv, price_df)
         return price_df
        
     def _calculate_reward(self, weight_dense=0.8, weight_sparse=1, weight_shaping=0.3,
@@ -1759,39 +1842,7 @@ class LiveMarginTradingEnv(gym.Env):
         return total_reward
 
     def _calculate_daily_pnl_and_cost(self, today_date):
-        done_trades = []
-        cursor = None
-        fee_rate = 0.000395 * 2  # Adjusted fee rate
-
-        # Convert today's date to timestamp
-        start_timestamp = int(datetime.datetime.strptime(today_date, "%Y-%m-%d").timestamp() * 1000)
-        end_timestamp = start_timestamp + 86400000  # Add one day in milliseconds
-
-        while True:
-            params = {
-                "category": "linear",
-                "limit": 100,
-                "startTime": start_timestamp,
-                "endTime": end_timestamp,
-                "cursor": cursor
-            }
-            response = self.session.get_closed_pnl(**params)
-
-            if response['retCode'] != 0:
-                break
-
-            pnl_list = response['result']['list']
-            cursor = response['result'].get('nextPageCursor', None)
-
-            for pnl in pnl_list:
-                trade_fee = float(pnl['orderPrice']) * float(pnl['qty']) * fee_rate
-                done_trades.append({
-                    'closedPnl': pnl['closedPnl'],
-                    'tradingFee': trade_fee
-                })
-
-            if not cursor:
-                break
+        done_trades = self._fetch_closed_pnl(today_date)
 
         # Calculate daily PnL and total trading fee
         daily_pnl = sum(float(trade['closedPnl']) for trade in done_trades)
@@ -1812,7 +1863,7 @@ class LiveMarginTradingEnv(gym.Env):
 
     def _close_all_position(self):
         
-        positions = self.exchange.fetch_positions()
+        positions = self._fetch_positions()
 
         # Close all positions in smaller chunks
         for position in positions:
@@ -1835,6 +1886,9 @@ class LiveMarginTradingEnv(gym.Env):
                 print("Order response:", order)
                 time.sleep(self.exchange.rateLimit / 1000)  # Respect rate limits
 
+                # Positions and balances have changed; nothing fetched before the order may be reused
+                self._obs_cache.clear()
+
     def _convert_usdt_to_btc(self, usdt_amount, btc_price):
         print(f"Converting USDT amount {usdt_amount} to BTC at price {btc_price}")
         btc_amount = usdt_amount / btc_price
@@ -1854,8 +1908,6 @@ class LiveMarginTradingEnv(gym.Env):
            
     def _execute_trade(self, action):
         
-        self.previous_account_info = self.account_info.copy()
-        
         symbol = 'BTCUSDT'  # Symbol for trading
         
         percentage = self._action_to_value(action)
@@ -1865,7 +1917,7 @@ class LiveMarginTradingEnv(gym.Env):
         leverage = LEVERAGE
 
         # Fetch and calculate initial NOP
-        positions = self.exchange.fetch_positions()
+        positions = self._fetch_positions()
         initial_nop = self._calculate_nop(positions)
         print(f"Initial NOP: {initial_nop}")
         
@@ -1882,7 +1934,7 @@ class LiveMarginTradingEnv(gym.Env):
             return
 
         # Fetch balance information and calculate order amounts
-        balance_info = self.exchange.fetch_balance()
+        balance_info = self._fetch_balance()
         # print("Balance Info:", balance_info)  # Debug: Print the entire balance info
 
         usdt_balance = next((coin for coin in balance_info['info']['result']['list'][0]['coin'] if coin['coin'] == 'USDT'), {})
@@ -1928,14 +1980,16 @@ class LiveMarginTradingEnv(gym.Env):
             btc_amount_to_order -= size_of_this_order
             time.sleep(self.exchange.rateLimit / 1000)
 
-        # Recalculate NOP after trading
-        positions = self.exchange.fetch_positions()
+        # Recalculate NOP after trading, from fresh positions
+        self._obs_cache.clear()
+        positions = self._fetch_positions()
         final_nop = self._calculate_nop(positions)
         print(f"Final NOP: {final_nop}")
 
+    @_per_step_cache
     def _fetch_account_info(self):
         # Fetch account balance
-        balance_info = self.exchange.fetch_balance()
+        balance_info = self._fetch_balance()
 
         # Extract USDT balance details
         usdt_balance = next((coin for coin in balance_info['info']['result']['list'][0]['coin'] if coin['coin'] == 'USDT'), {})
@@ -1969,24 +2023,11 @@ class LiveMarginTradingEnv(gym.Env):
         
 
         # Fetch open positions
-        positions = self.exchange.fetch_positions()
+        positions = self._fetch_positions()
         # print("Positions:", positions)
 
-        # Initialize NOP
-        nop = 0
-
         # Calculate NOP considering the side of each position
-        for position in positions:
-            if position['symbol'] == 'BTC/USDT:USDT':
-                contracts = float(position['contracts'])
-                entry_price = float(position['entryPrice'])
-                side = position['info']['side']
-                
-                # Adjust the NOP based on the position side
-                if side == 'Buy':
-                    nop += contracts * entry_price
-                elif side == 'Sell':
-                    nop -= contracts * entry_price
+        nop = self._position_stats(positions, 'BTC/USDT:USDT')['nop']
 
         # print(f"Current NOP: {nop}")
         
@@ -2009,22 +2050,19 @@ class LiveMarginTradingEnv(gym.Env):
         margin_level = self.equity / margin_required * 100 if margin_required else float('inf')
         portfolio_leverage = abs(nop) / self.equity if self.equity else 0
                
-        # Calculate Sortino ratio (considering risk-free rate)
-        if len(self.equity_history) > 1:
-            returns = np.array(self.equity_history)
-            daily_returns = np.diff(returns) / returns[:-1]
-            daily_excess_returns = daily_returns - self.risk_free_rate / 252
+        # Bring the running drawdown and Sortino accumulators up to date with equity_history
+        self._update_performance_metrics()
 
+        # Calculate Sortino ratio (considering risk-free rate)
+        if self._excess_count > 0:
             # Calculate downside deviation (volatility of negative excess returns)
-            negative_excess_returns = daily_excess_returns[daily_excess_returns < 0]
-            
-            if len(negative_excess_returns) > 1:
-                downside_deviation = np.std(negative_excess_returns)
+            if self._negative_count > 1:
+                downside_deviation = np.sqrt(self._negative_m2 / self._negative_count)
             else:
                 downside_deviation = 0
 
             if downside_deviation != 0:
-                self.sortino_ratio = np.mean(daily_excess_returns) / downside_deviation
+                self.sortino_ratio = self._excess_sum / self._excess_count / downside_deviation
             else:
                 self.sortino_ratio = 0
         else:
@@ -2032,13 +2070,9 @@ class LiveMarginTradingEnv(gym.Env):
             
             
         # Calculate drawdown
-        
-        self.running_max_equity = np.maximum.accumulate(self.equity_history)
-        self.drawdowns = (self.running_max_equity - self.equity_history) / self.running_max_equity
-        self.max_drawdown = np.max(self.drawdowns) * 100 if len(self.drawdowns) > 0 else 0
+        self.max_drawdown = self._max_drawdown_ratio * 100 if self._metrics_seen > 0 else 0
         
         # print("self.running_max_equity: ", self.running_max_equity)
-        # print("self.drawdowns: ", self.drawdowns)
         # print("self.max_drawdown: ", self.max_drawdown)
 
         # Construct account info dictionary
@@ -2062,75 +2096,17 @@ class LiveMarginTradingEnv(gym.Env):
         }
         
         return account_info
-        
-    def _fetch_ohlcv_data(self, timeframe):
-        # self.rate_limiter.wait()
-        time.sleep(0.1)
-        limit = 120
-        ohlcv = self.exchange.fetch_ohlcv(self.symbol, timeframe, limit=limit)
-        columns = ['Time', 'Open', 'High', 'Low', 'Close', 'Volume']
-        ohlcv_df = pd.DataFrame(ohlcv, columns=columns)
-        ohlcv_df['Time'] = pd.to_datetime(ohlcv_df['Time'], unit='ms')
-        return ohlcv_df
 
-    def _fetch_open_positions(self):
-        # Fetch open positions
-        positions = self.exchange.fetch_positions()
+    @_per_step_cache
+    def _fetch_balance(self):
+        return self.exchange.fetch_balance()
 
-        # Initialize variables for open position dictionary
-        total_contracts_btc = 0
-        total_entry_value_usd = 0
-        total_unrealized_pnl_usd = 0
-        trade_not_executed = 0  # Assuming no trades are pending initially
-        stopped_out = 0  # Assuming no positions are stopped out initially
-
-        # Initialize NOP
-        nop_usd = 0
-
-        # Process each position
-        for position in positions:
-            contracts = float(position['contracts'])
-            entry_price = float(position['entryPrice'])
-            
-            # Check for None value and assign a default if necessary
-            unrealized_pnl = float(position['unrealizedPnl']) if position['unrealizedPnl'] is not None else 0.0
-
-            side = position['info']['side']
-
-            # Calculate NOP considering the side of each position
-            if side == 'Buy':
-                nop_usd += contracts * entry_price
-            elif side == 'Sell':
-                nop_usd -= contracts * entry_price
-
-            # Update other totals
-            total_contracts_btc += contracts
-            total_entry_value_usd += contracts * entry_price
-            total_unrealized_pnl_usd += unrealized_pnl
-
-        # Current spot price (last trade price) - Replace 'BTC/USDT' with your symbol
-        spot_price_usd = self.exchange.fetch_ticker('BTCUSDT')['bid']
-
-        # Calculate average price if there are open positions
-        avg_price_usd = total_entry_value_usd / total_contracts_btc if total_contracts_btc > 0 else 0
-
-        # Construct the open position dictionary
-        open_positions = {
-            "nop": nop_usd,  # Directly as float
-            "avg_price": avg_price_usd,  # Directly as float
-            "spot_price": spot_price_usd,  # Directly as float
-            "Floating_Profit": total_unrealized_pnl_usd,  # Directly as float
-            "trade_not_executed": trade_not_executed,  # Directly as int
-            "stopped_out": stopped_out  # Directly as int
-        }
-        
-        return open_positions
-
-    def _fetch_trades_summary(self):
+    # Closed PnL entries for one UTC day, following the pagination cursor to the end
+    @_per_step_cache
+    def _fetch_closed_pnl(self, today_date):
         done_trades = []
         cursor = None
         fee_rate = 0.000395 * 2  # Adjusted fee rate
-        today_date = datetime.datetime.utcnow().strftime('%Y-%m-%d')
 
         # Convert today's date to timestamp
         start_timestamp = int(datetime.datetime.strptime(today_date, "%Y-%m-%d").timestamp() * 1000)
@@ -2161,6 +2137,93 @@ class LiveMarginTradingEnv(gym.Env):
 
             if not cursor:
                 break
+
+        return done_trades
+        
+    # Candles for one timeframe, refreshed once per timestep; pacing is left to ccxt's enableRateLimit.
+    # Kept apart from _obs_cache so clearing it after an order does not refetch market data
+    def _fetch_ohlcv(self, timeframe):
+        cached = self._ohlcv_cache.get(timeframe)
+        if cached is not None and cached[2] == self.timestep:
+            return cached[1]
+        return self._store_ohlcv(timeframe, self.exchange.fetch_ohlcv(self.symbol, timeframe, limit=self._ohlcv_limit(timeframe)))
+
+    def _fetch_ohlcv_data(self, timeframe):
+        ohlcv = self._fetch_ohlcv(timeframe)
+        columns = ['Time', 'Open', 'High', 'Low', 'Close', 'Volume']
+        ohlcv_df = pd.DataFrame(ohlcv, columns=columns)
+        ohlcv_df['Time'] = pd.to_datetime(ohlcv_df['Time'], unit='ms')
+        return ohlcv_df
+
+    @_per_step_cache
+    def _fetch_open_positions(self):
+        # Fetch open positions
+        positions = self._fetch_positions()
+
+        # Initialize variables for open position dictionary
+        trade_not_executed = 0  # Assuming no trades are pending initially
+        stopped_out = 0  # Assuming no positions are stopped out initially
+
+        # NOP and totals over every position
+        stats = self._position_stats(positions)
+        nop_usd = stats['nop']
+        total_contracts_btc = stats['contracts']
+        total_entry_value_usd = stats['entry_value']
+        total_unrealized_pnl_usd = stats['unrealized_pnl']
+
+        # Current spot price (last trade price) - Replace 'BTC/USDT' with your symbol
+        spot_price_usd = self._fetch_ticker('BTCUSDT')['bid']
+
+        # Calculate average price if there are open positions
+        avg_price_usd = total_entry_value_usd / total_contracts_btc if total_contracts_btc > 0 else 0
+
+        # Construct the open position dictionary
+        open_positions = {
+            "nop": nop_usd,  # Directly as float
+            "avg_price": avg_price_usd,  # Directly as float
+            "spot_price": spot_price_usd,  # Directly as float
+            "Floating_Profit": total_unrealized_pnl_usd,  # Directly as float
+            "trade_not_executed": trade_not_executed,  # Directly as int
+            "stopped_out": stopped_out  # Directly as int
+        }
+        
+        return open_positions
+
+    @_per_step_cache
+    def _fetch_positions(self):
+        return self.exchange.fetch_positions()
+
+    # NOP (signed by side: 'Buy' long, 'Sell' short, anything else ignored) and totals of the given positions,
+    # optionally only those of one symbol. Fields are converted once into arrays and summed in one pass each
+    @staticmethod
+    def _position_stats(positions, symbol=None):
+        if symbol is not None:
+            positions = [position for position in positions if position['symbol'] == symbol]
+        count = len(positions)
+        contracts = np.fromiter((float(p['contracts']) for p in positions), dtype=np.float64, count=count)
+        entry_price = np.fromiter((float(p['entryPrice']) for p in positions), dtype=np.float64, count=count)
+        # A missing unrealized PnL counts as zero
+        unrealized_pnl = np.fromiter((float(p['unrealizedPnl']) if p['unrealizedPnl'] is not None else 0.0 for p in positions),
+                                     dtype=np.float64, count=count)
+        sides = np.array([p['info']['side'] for p in positions], dtype=object)
+        sign = (sides == 'Buy').astype(np.float64) - (sides == 'Sell')
+
+        entry_value = contracts * entry_price
+        return {
+            'nop': float(sign @ entry_value),
+            'contracts': float(contracts.sum()),
+            'entry_value': float(entry_value.sum()),
+            'unrealized_pnl': float(unrealized_pnl.sum()),
+        }
+
+    @_per_step_cache
+    def _fetch_ticker(self, symbol):
+        return self.exchange.fetch_ticker(symbol)
+
+    @_per_step_cache
+    def _fetch_trades_summary(self):
+        today_date = datetime.datetime.utcnow().strftime('%Y-%m-%d')
+        done_trades = self._fetch_closed_pnl(today_date)
            
         # Summarize trades
         num_trades = len(done_trades)
@@ -2184,8 +2247,9 @@ class LiveMarginTradingEnv(gym.Env):
         }
 
     def _get_observation(self):
-                
-        self.previous_account_info = self._fetch_account_info()
+        # Every fetcher below is called once and memoized for this timestep, so step() and
+        # reset() reading the same account state again cost no extra requests
+
         # Get current price data
         current_price_data = self._calculate_price_df().iloc[-1].values
 
@@ -2210,6 +2274,88 @@ class LiveMarginTradingEnv(gym.Env):
 
         return observation
 
+    # Fold the equity samples appended since the last call into running totals: the running max and worst drawdown,
+    # and the count, sum and (Welford) squared deviations of the excess returns, so updating the metrics costs
+    # O(new samples) rather than a pass over the whole history. Starts over if equity_history has been replaced
+    def _update_performance_metrics(self):
+        history = self.equity_history
+        if history is not self._metrics_history:
+            self._metrics_history = history
+            self._metrics_seen = 0
+            self.running_max_equity = -np.inf
+            self._max_drawdown_ratio = np.float64(0)
+            self._last_equity = None
+            self._excess_count = 0
+            self._excess_sum = 0.0
+            self._negative_count = 0
+            self._negative_mean = 0.0
+            self._negative_m2 = 0.0
+
+        for equity in history[self._metrics_seen:]:
+            equity = np.float64(equity)
+            if self._last_equity is not None:
+                excess_return = (equity - self._last_equity) / self._last_equity - self.risk_free_rate / 252
+                self._excess_count += 1
+                self._excess_sum += excess_return
+                if excess_return < 0:
+                    self._negative_count += 1
+                    delta = excess_return - self._negative_mean
+                    self._negative_mean += delta / self._negative_count
+                    self._negative_m2 += delta * (excess_return - self._negative_mean)
+            self._last_equity = equity
+
+            self.running_max_equity = np.maximum(self.running_max_equity, equity)
+            self._max_drawdown_ratio = np.maximum(self._max_drawdown_ratio, (self.running_max_equity - equity) / self.running_max_equity)
+        self._metrics_seen = len(history)
+
+    # Send this timestep's independent REST requests at once and seed the per-step cache with the replies, so the
+    # fetchers that follow are cache hits: one round trip instead of one per request. The closed-PnL pages come from
+    # blocking pybit calls and are walked in a worker thread meanwhile. A failed request is simply left uncached
+    # and retried by its own fetcher. With account=False only the positions and expired candles are fetched
+    def _prefetch(self, account=True):
+        for key, result in self._loop.run_until_complete(self._fetch_concurrently(account)):
+            if isinstance(result, BaseException):
+                continue
+            if key[0] == '_fetch_ohlcv':
+                self._store_ohlcv(key[1], result)
+            else:
+                self._obs_cache[key] = (self.timestep, result)
+
+    async def _fetch_concurrently(self, account):
+        requests = {('_fetch_positions',): self.async_exchange.fetch_positions()}
+        for tf in self.OHLCV_TIMEFRAMES:
+            requests[('_fetch_ohlcv', tf)] = self.async_exchange.fetch_ohlcv(self.symbol, tf, limit=self._ohlcv_limit(tf))
+        if account:
+            requests[('_fetch_balance',)] = self.async_exchange.fetch_balance()
+            requests[('_fetch_ticker', 'BTCUSDT')] = self.async_exchange.fetch_ticker('BTCUSDT')
+            today_date = datetime.datetime.utcnow().strftime('%Y-%m-%d')
+            requests[('_fetch_closed_pnl', today_date)] = asyncio.get_running_loop().run_in_executor(None, self._fetch_closed_pnl, today_date)
+
+        results = await asyncio.gather(*requests.values(), return_exceptions=True)
+        return zip(requests, results)
+
+    # Closed candles never change, so once the full window is cached only the last two bars are refetched: the
+    # newest closed one and the one still forming. That holds while the forming bar is at most one bar past the
+    # newest cached one; after a longer gap the whole window is fetched again
+    def _ohlcv_limit(self, timeframe):
+        return 2 if time.time() < self._ohlcv_cache.get(timeframe, (0,))[0] else self.OHLCV_LIMIT
+
+    # Splice freshly fetched candles over the cached ones from their first timestamp on. When the refresh
+    # changed nothing the cached list itself is returned, so the signal and price-frame caches keyed on it still hit
+    def _store_ohlcv(self, timeframe, ohlcv):
+        cached = self._ohlcv_cache.get(timeframe, (0, []))[1]
+        if cached and ohlcv and cached[0][0] < ohlcv[0][0] <= cached[-1][0]:
+            keep = len(cached)
+            while cached[keep - 1][0] >= ohlcv[0][0]:
+                keep -= 1
+            if cached[keep:] == ohlcv:
+                ohlcv = cached
+            else:
+                ohlcv = (cached[:keep] + ohlcv)[-self.OHLCV_LIMIT:]
+        overlaps_until = ohlcv[-1][0] / 1000 + 2 * self.OHLCV_TTL[timeframe] if ohlcv else 0
+        self._ohlcv_cache[timeframe] = (overlaps_until, ohlcv, self.timestep)
+        return ohlcv
+
     def _timestamp_to_utc(self, ts):
         return datetime.datetime.utcfromtimestamp(int(ts) / 1000).strftime('%Y-%m-%d %H:%M:%S')
 
@@ -2218,6 +2364,8 @@ class LiveMarginTradingEnv(gym.Env):
 
     def reset(self, *, seed=None, options=None):
         
+        self._obs_cache.clear()
+        self._prefetch()
         self.account_info = self._fetch_account_info()
         self.open_positions = self._fetch_open_positions()
         self.done_trades = self._fetch_trades_summary()
@@ -2231,6 +2379,11 @@ class LiveMarginTradingEnv(gym.Env):
     def step(self, action):
         current_timestamp = datetime.datetime.now()
 
+        # Snapshot last step's account state for the reward, then start this step with nothing cached
+        self.previous_account_info = self.account_info.copy()
+        self._obs_cache.clear()
+        self._prefetch(account=False)
+
         # Fetch current Kijun signals
         current_signals = self._calculate_and_concatenate_signals().iloc[-1]
         kijun_signal_15 = current_signals['signal_Kijun_15min']
@@ -2249,7 +2402,7 @@ class LiveMarginTradingEnv(gym.Env):
       
         
                 # Fetch and calculate initial NOP
-        positions = self.exchange.fetch_positions()
+        positions = self._fetch_positions()
         
         nop = self._calculate_nop(positions)
         
@@ -2263,6 +2416,7 @@ class LiveMarginTradingEnv(gym.Env):
 
         # Increment timestep
         self.timestep += 1
+        self._prefetch()
 
         # Fetch updated account information and open positions
         self.account_info = self._fetch_account_info()
@@ -2297,4 +2451,5 @@ class LiveMarginTradingEnv(gym.Env):
 
     def close(self):
         # Clean up resources if necessary
-        pass
+        self._loop.run_until_complete(self.async_exchange.close())
+        self._loop.close()